@@ -0,0 +1,203 @@
+# BENCHMARK
+# Runs each report against the local mock Jira/Slack at a chosen scale and records
+# time per stage, peak RSS and request counts. Results are saved as JSON and can be
+# compared against a baseline file to flag regressions.
+#
+#   python benchmark.py --boards 50 --issues 5000 --output bench.json
+#   python benchmark.py --compare bench.json
+
+import os
+import sys
+import json
+import time
+import resource
+import argparse
+import tempfile
+import importlib
+import threading
+import subprocess
+from collections import Counter
+from datetime import datetime
+from sprintwatch import REPORTS
+
+# Stages are attributed by sampling the main thread's stack; the first group found anywhere
+# on the stack wins, so e.g. numpy inside matplotlib counts as rendering, not transform
+STAGES = [
+    ("slack", ("slack_sdk", "slack_publisher")),
+    ("render", ("charts", "matplotlib", "seaborn", "networkx.drawing", "PIL")),
+    ("fetch", ("jira_client", "jira_data", "issue_cache", "sprint_index", "requests", "urllib3", "http.client")),
+    ("transform", ("pandas", "numpy", "networkx"))
+]
+SAMPLE_INTERVAL = 0.005
+
+# Regression thresholds for --compare
+TIME_FLOOR = 0.05
+RSS_FLOOR = 5.0
+
+# === Stage sampling (worker side) ===
+def classify(modules):
+    for stage, prefixes in STAGES:
+        for name in modules:
+            if any(name == p or name.startswith(p + ".") for p in prefixes):
+                return stage
+    return "other"
+
+def sample_stages(thread_id, counts, stop):
+    while not stop.wait(SAMPLE_INTERVAL):
+        frame = sys._current_frames().get(thread_id)
+        modules = set()
+        while frame is not None:
+            modules.add(frame.f_globals.get("__name__", ""))
+            frame = frame.f_back
+        counts[classify(modules)] += 1
+
+def run_worker(report):
+    module_name, entry = REPORTS[report]
+    board_ids = json.loads(os.environ["BENCH_BOARDS"])
+
+    start = time.perf_counter()
+    module = importlib.import_module(module_name)
+    import_s = time.perf_counter() - start
+
+    # Scale the hard-coded board maps and keep output in the scratch dir (Slack goes to the mock via SLACK_API_URL)
+    if hasattr(module, "boards"):
+        module.boards = {f"Board {board_id}": board_id for board_id in board_ids}
+    for attr in ("CSV_PATH", "CHART_PATH"):
+        if hasattr(module, attr):
+            setattr(module, attr, os.path.basename(getattr(module, attr)))
+
+    counts = Counter()
+    stop = threading.Event()
+    sampler = threading.Thread(target=sample_stages, args=(threading.get_ident(), counts, stop), daemon=True)
+    sampler.start()
+    start = time.perf_counter()
+    getattr(module, entry)()
+    # Posts go out on a background thread; the run isn't done until they have
+    importlib.import_module("slack_publisher").flush()
+    wall_s = time.perf_counter() - start
+    stop.set()
+    sampler.join()
+
+    samples = sum(counts.values()) or 1
+    return {
+        "import_s": round(import_s, 4),
+        "wall_s": round(wall_s, 4),
+        "stages": {stage: round(wall_s * n / samples, 4) for stage, n in sorted(counts.items())},
+        "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+    }
+
+# === Orchestration (parent side) ===
+def run_suite(args):
+    import mock_jira
+
+    dataset = mock_jira.build_dataset(args.boards, args.sprints, args.issues, args.links, args.epics, args.histories)
+    mock = mock_jira.MockJira(dataset, latency=args.latency / 1000, rate_429=args.rate_429, retry_after=0)
+    server, url = mock_jira.start_server(mock)
+    board_ids = list(dataset["board_sprints"])
+
+    results = {}
+    for report in args.reports:
+        print(f"⏱️ {report} ...")
+        with tempfile.TemporaryDirectory() as scratch:
+            env = dict(
+                os.environ,
+                JIRA_DOMAIN=url,
+                SPRINTWATCH_CACHE_DIR=os.path.join(scratch, "cache"),
+                STORY_POINTS_FIELD=mock_jira.STORY_POINTS_FIELD,
+                SLACK_BOT_TOKEN="xoxb-benchmark",
+                SLACK_CHANNEL_ID="CBENCHMARK",
+                SLACK_API_URL=f"{url}/api/",
+                BENCH_BOARDS=json.dumps(board_ids),
+                MPLBACKEND="Agg",
+                PYTHONPATH=os.path.dirname(os.path.abspath(__file__))
+            )
+            mock.stats.clear()
+            proc = subprocess.run(
+                [sys.executable, os.path.abspath(__file__), "--worker", report],
+                cwd=scratch, env=env, capture_output=True, text=True
+            )
+            if proc.returncode != 0:
+                print(proc.stderr)
+                raise SystemExit(f"❌ {report} failed under the benchmark")
+            result = json.loads(proc.stdout.strip().splitlines()[-1])
+
+        slack_calls = sum(n for endpoint, n in mock.stats.items() if endpoint.startswith(("/api/", "/upload/")))
+        result["jira_requests"] = sum(mock.stats.values()) - slack_calls
+        result["slack_requests"] = slack_calls
+        result["requests_by_endpoint"] = dict(mock.stats)
+        results[report] = result
+        print(f"   {result['wall_s']}s, {result['peak_rss_mb']} MB, {result['jira_requests']} Jira calls, stages {result['stages']}")
+
+    server.shutdown()
+    return {
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "scale": {
+            "boards": args.boards, "sprints": args.sprints, "issues": args.issues, "links": args.links,
+            "epics": args.epics, "histories": args.histories, "latency_ms": args.latency, "rate_429": args.rate_429
+        },
+        "reports": results
+    }
+
+# === Baseline comparison ===
+def compare(current, baseline, threshold):
+    regressions = []
+
+    def check(report, metric, new, old, floor):
+        if old is not None and new > old * (1 + threshold) and new - old > floor:
+            regressions.append(f"{report}.{metric}: {old} -> {new}")
+
+    for report, new in current["reports"].items():
+        old = baseline.get("reports", {}).get(report)
+        if not old:
+            continue
+        check(report, "wall_s", new["wall_s"], old["wall_s"], TIME_FLOOR)
+        for stage, seconds in new["stages"].items():
+            check(report, f"stages.{stage}", seconds, old["stages"].get(stage, 0), TIME_FLOOR)
+        check(report, "peak_rss_mb", new["peak_rss_mb"], old["peak_rss_mb"], RSS_FLOOR)
+        check(report, "jira_requests", new["jira_requests"], old["jira_requests"], 0)
+    if current["scale"] != baseline.get("scale"):
+        print(f"⚠️ Scale differs from the baseline: {baseline.get('scale')} vs {current['scale']}")
+    return regressions
+
+# === Entry Point ===
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the reports against the local mock Jira/Slack")
+    parser.add_argument("--reports", nargs="+", choices=list(REPORTS), default=list(REPORTS))
+    parser.add_argument("--boards", type=int, default=5)
+    parser.add_argument("--sprints", type=int, default=8)
+    parser.add_argument("--issues", type=int, default=2000)
+    parser.add_argument("--links", type=float, default=1.0)
+    parser.add_argument("--epics", type=int, default=20)
+    parser.add_argument("--histories", type=int, default=5)
+    parser.add_argument("--latency", type=float, default=0.0, help="Mock Jira latency per request in ms")
+    parser.add_argument("--rate-429", type=float, default=0.0)
+    parser.add_argument("--output", default="benchmark_results.json")
+    parser.add_argument("--compare", help="Baseline results file; exit 1 on regression")
+    parser.add_argument("--threshold", type=float, default=0.25, help="Allowed slowdown before flagging (0.25 = 25%%)")
+    parser.add_argument("--worker", choices=list(REPORTS), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        result = run_worker(args.worker)
+        sys.stdout.flush()
+        print(json.dumps(result))
+        sys.exit(0)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+
+    current = run_suite(args)
+    with open(args.output, "w") as f:
+        json.dump(current, f, indent=2)
+    print(f"✅ Results written to {args.output}")
+
+    if baseline:
+        regressions = compare(current, baseline, args.threshold)
+        if regressions:
+            print("❌ Regressions against baseline:")
+            for line in regressions:
+                print(f"   {line}")
+            sys.exit(1)
+        print("✅ No regressions against baseline")
@@ -0,0 +1,104 @@
+# BLOCKER ANALYSIS
+# Chain analytics over the dependency graph, with edges pointing blocker -> blocked.
+# The graph is split into weakly connected blocks; each block's result is cached under a hash of
+# its edges, so a run only recomputes the blocks whose links (or components) changed.
+
+import os
+import json
+import hashlib
+import networkx as nx
+from jira_client import CACHE_DIR
+
+CACHE_PATH = os.path.join(CACHE_DIR, "blocker_analysis.json")
+TOP_N = 10
+
+# === Cache ===
+def load_cache():
+    try:
+        with open(CACHE_PATH) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def save_cache(cache):
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    with open(CACHE_PATH, "w") as f:
+        json.dump(cache, f)
+
+def block_signature(block, component_of):
+    digest = hashlib.sha1()
+    for node in sorted(block):
+        digest.update(f"{node}|{component_of.get(node, 'None')}\n".encode())
+    for a, b in sorted(block.edges()):
+        digest.update(f"{a}>{b}\n".encode())
+    return digest.hexdigest()
+
+# === Per-block analysis (linear in the block, plus bitset unions for reachability) ===
+def analyze_block(block, component_of):
+    dag = nx.condensation(block)
+    order = list(nx.topological_sort(dag))
+    members = {c: sorted(dag.nodes[c]["members"]) for c in dag}
+
+    # Longest chain: DP over the condensation in reverse topological order, weighted by SCC size
+    length, successor = {}, {}
+    for c in reversed(order):
+        tail = max(dag.successors(c), key=lambda s: length[s], default=None)
+        length[c] = len(members[c]) + (length[tail] if tail is not None else 0)
+        successor[c] = tail
+    chain, c = [], max(order, key=lambda c: length[c])
+    while c is not None:
+        chain.extend(members[c])
+        c = successor[c]
+
+    # Transitive downstream count: each SCC's reach is its own bits OR its successors' reach
+    bit = {node: 1 << i for i, node in enumerate(block)}
+    reach, downstream = {}, {}
+    for c in reversed(order):
+        bits = 0
+        for node in members[c]:
+            bits |= bit[node]
+        for s in dag.successors(c):
+            bits |= reach[s]
+        reach[c] = bits
+        for node in members[c]:
+            downstream[node] = bits.bit_count() - 1
+
+    cross_component = {}
+    for a, b in block.edges():
+        if a != b and component_of.get(a, "None") != component_of.get(b, "None"):
+            cross_component[a] = cross_component.get(a, 0) + 1
+
+    cycles = [members[c] for c in dag if len(members[c]) > 1]
+    cycles += [[node] for node in nx.nodes_with_selfloops(block)]
+    return {"longest_chain": chain, "downstream": downstream, "cross_component": cross_component, "cycles": cycles}
+
+# === Whole-graph analysis ===
+def analyze(graph, component_of):
+    cache = load_cache()
+    current, results, recomputed = {}, [], 0
+    for nodes in nx.weakly_connected_components(graph):
+        block = graph.subgraph(nodes)
+        signature = block_signature(block, component_of)
+        result = cache.get(signature)
+        if result is None:
+            result = analyze_block(block, component_of)
+            recomputed += 1
+        current[signature] = result
+        results.append(result)
+    # Only blocks that still exist are kept, so the cache never outgrows the project
+    save_cache(current)
+
+    downstream, cross_component, cycles = {}, {}, []
+    for result in results:
+        downstream.update(result["downstream"])
+        cross_component.update(result["cross_component"])
+        cycles.extend(result["cycles"])
+    return {
+        "blocks": len(results),
+        "recomputed": recomputed,
+        "downstream": downstream,
+        "cross_component": cross_component,
+        "cycles": sorted(cycles, key=len, reverse=True),
+        "top_unblockers": sorted(downstream.items(), key=lambda kv: (-kv[1], kv[0]))[:TOP_N],
+        "longest_chains": sorted((r["longest_chain"] for r in results), key=len, reverse=True)[:TOP_N]
+    }
@@ -0,0 +1,95 @@
+# CHARTS
+# Shared chart pipeline for the reports. A chart is a job: a module-level draw function, the
+# arguments it draws from (usually a DataFrame) and an output path. Jobs are rendered with the
+# Agg backend, several at once in a process pool, and skipped entirely when their input hashes
+# the same as last time and the file is still there. CHART_FORMAT=svg switches every chart to SVG.
+# Pool workers re-import the module a draw function lives in, so it must be safe to import
+# (definitions only, the work behind `if __name__ == "__main__"`).
+
+import os
+import json
+import atexit
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from jira_client import CACHE_DIR
+from report_manifest import fingerprint
+
+CHART_FORMAT = os.getenv("CHART_FORMAT", "png").lower()  # png | svg
+MANIFEST_PATH = os.path.join(CACHE_DIR, "charts.json")
+MAX_WORKERS = int(os.getenv("CHART_WORKERS", str(min(4, os.cpu_count() or 1))))
+# Workers start from a clean forkserver (spawn where there is none), never a fork of this process:
+# the Slack sender and Jira prefetch threads may be holding locks a forked child would inherit
+START_METHOD = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+
+# Drop volatile metadata so identical charts come out byte-identical
+SAVE_OPTIONS = {
+    "png": {"pil_kwargs": {"optimize": True, "compress_level": 9}, "metadata": {"Software": None}},
+    "svg": {"metadata": {"Date": None}}
+}
+
+_pool = None
+
+# === Paths & hashing ===
+def chart_path(path):
+    return os.path.splitext(path)[0] + "." + CHART_FORMAT
+
+def input_hash(draw, args):
+    return fingerprint(f"{draw.__module__}.{draw.__qualname__}", CHART_FORMAT, *args)
+
+def load_manifest():
+    try:
+        with open(MANIFEST_PATH) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def save_manifest(manifest):
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    with open(MANIFEST_PATH, "w") as f:
+        json.dump(manifest, f, indent=2)
+
+# === Rendering ===
+def draw_and_save(draw, args, path):
+    # Runs in a pool worker (or inline for a single chart)
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    draw(*args)
+    plt.savefig(path, format=CHART_FORMAT, bbox_inches="tight", **SAVE_OPTIONS[CHART_FORMAT])
+    plt.close("all")
+    return path
+
+def get_pool():
+    # One pool per process; the runner reuses its warm workers across reports
+    global _pool
+    if _pool is None:
+        _pool = ProcessPoolExecutor(max_workers=MAX_WORKERS, mp_context=multiprocessing.get_context(START_METHOD))
+        atexit.register(_pool.shutdown)
+    return _pool
+
+def render(jobs):
+    # jobs: (draw, args, path) triples. Returns the written paths in job order.
+    manifest = load_manifest()
+    paths, todo = [], []
+    for draw, args, path in jobs:
+        path = chart_path(path)
+        digest = input_hash(draw, args)
+        paths.append(path)
+        if manifest.get(os.path.abspath(path)) == digest and os.path.exists(path):
+            print(f"♻️ {path} unchanged; not re-rendered")
+            continue
+        todo.append((draw, args, path, digest))
+
+    if len(todo) == 1 or MAX_WORKERS <= 1:
+        for draw, args, path, _ in todo:
+            draw_and_save(draw, args, path)
+    elif todo:
+        futures = [get_pool().submit(draw_and_save, draw, args, path) for draw, args, path, _ in todo]
+        for future in futures:
+            future.result()
+
+    if todo:
+        manifest.update({os.path.abspath(path): digest for _, _, path, digest in todo})
+        save_manifest(manifest)
+    return paths
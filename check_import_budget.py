@@ -0,0 +1,71 @@
+# IMPORT BUDGET CHECK
+# Imports each report in a fresh interpreter and fails if it takes longer than the budget or
+# drags in the plotting / Slack stacks at module load (those must stay lazy for --csv-only runs).
+#
+#   python check_import_budget.py --budget 1.5
+
+import sys
+import json
+import argparse
+import subprocess
+
+MODULES = [
+    "sprintwatch",
+    "sprint_completion_report",
+    "sprint_readiness_report_v2",
+    "dependency_status_report",
+    "slipping_stories_report",
+    "slip_index",
+    "snapshot"
+]
+LAZY = ["matplotlib", "seaborn", "slack_sdk"]
+# Best of a few runs, so one slow disk read on a shared runner doesn't fail the check
+RUNS = 3
+
+PROBE = """
+import sys, json, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(json.dumps({{"seconds": elapsed, "loaded": [m for m in {lazy!r} if m in sys.modules]}}))
+"""
+
+def measure(module):
+    best = None
+    for _ in range(RUNS):
+        proc = subprocess.run(
+            [sys.executable, "-c", PROBE.format(module=module, lazy=LAZY)],
+            capture_output=True, text=True
+        )
+        if proc.returncode != 0:
+            return {"error": proc.stderr.strip().splitlines()[-1]}
+        result = json.loads(proc.stdout.strip().splitlines()[-1])
+        if best is None or result["seconds"] < best["seconds"]:
+            best = result
+    return best
+
+# === Entry Point ===
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fail if a report's import time or eager imports exceed the budget")
+    parser.add_argument("--budget", type=float, default=1.5, help="Seconds allowed per module import")
+    parser.add_argument("modules", nargs="*", default=MODULES)
+    args = parser.parse_args()
+
+    failures = []
+    for module in args.modules:
+        result = measure(module)
+        if "error" in result:
+            failures.append(f"{module}: import failed ({result['error']})")
+            continue
+        print(f"⏱️ {module:<30} {result['seconds']:.2f}s")
+        if result["seconds"] > args.budget:
+            failures.append(f"{module}: {result['seconds']:.2f}s > {args.budget:.2f}s budget")
+        if result["loaded"]:
+            failures.append(f"{module}: imports {', '.join(result['loaded'])} at load time")
+
+    if failures:
+        print("❌ Import budget exceeded:")
+        for line in failures:
+            print(f"   {line}")
+        sys.exit(1)
+    print("✅ All imports within budget")
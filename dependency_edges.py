@@ -0,0 +1,114 @@
+# DEPENDENCY EDGES
+# Compact, de-duplicated store of issue links, normalized to point source -> target in the
+# link's outward sense ("A blocks B" is A -> B), whichever side of the link Jira reported it on.
+
+import sys
+from array import array
+import networkx as nx
+
+class EdgeStore:
+    def __init__(self):
+        # Issue keys become small ints; statuses, components and link types are interned strings
+        self.ids = {}
+        self.keys = []
+        self.status = []
+        self.component = []
+        self.type_ids = {}
+        self.link_types = []
+        self.sources = array("I")
+        self.targets = array("I")
+        self.types = array("H")
+        self._seen = set()
+        # Nodes we have the full issue for; everything else came from a link stub
+        self.full = set()
+
+    # === Nodes ===
+    def node(self, key, status=None, component=None):
+        node_id = self.ids.get(key)
+        if node_id is None:
+            node_id = self.ids[key] = len(self.keys)
+            self.keys.append(sys.intern(key))
+            self.status.append(None)
+            self.component.append(None)
+        # Details from the issue itself beat whatever a link stub carried
+        if status is not None:
+            self.status[node_id] = sys.intern(status)
+        if component is not None:
+            self.component[node_id] = sys.intern(component)
+        return node_id
+
+    def link_type(self, name):
+        type_id = self.type_ids.get(name)
+        if type_id is None:
+            type_id = self.type_ids[name] = len(self.link_types)
+            self.link_types.append(sys.intern(name))
+        return type_id
+
+    # === Edges ===
+    def add(self, source, target, link_type):
+        type_id = self.link_type(link_type)
+        # Packed into one int so the dedup set stays small
+        edge = (source << 40) | (target << 16) | type_id
+        if edge in self._seen:
+            return False
+        self._seen.add(edge)
+        self.sources.append(source)
+        self.targets.append(target)
+        self.types.append(type_id)
+        return True
+
+    def add_issue(self, issue):
+        fields = issue["fields"]
+        components = fields.get("components", [])
+        this = self.node(issue["key"], fields["status"]["name"], components[0]["name"] if components else "None")
+        self.full.add(this)
+        for link in fields.get("issuelinks", []):
+            linked = link.get("inwardIssue") or link.get("outwardIssue")
+            if not linked:
+                continue
+            other = self.node(linked["key"], linked.get("fields", {}).get("status", {}).get("name"))
+            link_type = link.get("type", {}).get("name", "Link")
+            # outwardIssue: this <outward> other; inwardIssue: other <outward> this
+            if "outwardIssue" in link:
+                self.add(this, other, link_type)
+            else:
+                self.add(other, this, link_type)
+
+    def external_keys(self):
+        return [key for node_id, key in enumerate(self.keys) if node_id not in self.full]
+
+    def fill(self, details):
+        for key, found in details.items():
+            if key in self.ids:
+                self.node(key, found.get("status"), found.get("component"))
+
+    def edges(self):
+        for source, target, type_id in zip(self.sources, self.targets, self.types):
+            yield self.keys[source], self.keys[target], self.link_types[type_id]
+
+    # === Views ===
+    def component_map(self):
+        return {key: component or "None" for key, component in zip(self.keys, self.component)}
+
+    def rows(self):
+        # One CSV row per link: the dependent (target) issue and the issue it depends on (source)
+        for source, target, type_id in zip(self.sources, self.targets, self.types):
+            yield {
+                "Issue": self.keys[target],
+                "Status": self.status[target],
+                "Component": self.component[target] or "None",
+                "Depends On": self.keys[source],
+                "Dependency Status": self.status[source],
+                "Dependency Component": self.component[source] or "None",
+                "Link Type": self.link_types[type_id]
+            }
+
+    def to_graph(self, link_types=None):
+        # link_types: only keep links of these types (case-insensitive), e.g. {"blocks"}
+        wanted = {name.lower() for name in link_types} if link_types else None
+        graph = nx.DiGraph()
+        graph.add_edges_from(
+            (source, target, {"type": link_type}) for source, target, link_type in self.edges()
+            if wanted is None or link_type.lower() in wanted
+        )
+        return graph
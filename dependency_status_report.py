@@ -1,127 +1,168 @@
 import os
-import base64
-import requests
+import argparse
 import pandas as pd
 import networkx as nx
-import matplotlib.pyplot as plt
 from dotenv import load_dotenv
-from slack_sdk import WebClient
+from charts import render
+from jira_data import project_issues, linked_issues
+from blocker_analysis import analyze as analyze_blockers
+from dependency_edges import EdgeStore
+from report_manifest import fingerprint, unchanged, record
+from slack_publisher import publish, disable as disable_slack
+from snapshot import load_snapshot
 
 # === Load Config ===
 load_dotenv()
-EMAIL = os.getenv("EMAIL")
-API_TOKEN = os.getenv("API_TOKEN")
-JIRA_DOMAIN = os.getenv("JIRA_DOMAIN")
-PROJECT_KEY = os.getenv("JIRA_PROJECT_KEY")
-SLACK_BOT_TOKEN = os.getenv("SLACK_BOT_TOKEN")
-SLACK_CHANNEL = os.getenv("SLACK_CHANNEL_ID")
-
-HEADERS = {
-    "Accept": "application/json",
-    "Authorization": f"Basic {base64.b64encode(f'{EMAIL}:{API_TOKEN}'.encode()).decode()}"
-}
 
 CSV_PATH = "dependency_status_report.csv"
 CHART_PATH = "dependency_graph.png"
+ANALYSIS_CSV_PATH = "dependency_blocker_analysis.csv"
 
-# === Slack ===
-def post_to_slack(message):
-    client = WebClient(token=SLACK_BOT_TOKEN)
-    client.chat_postMessage(channel=SLACK_CHANNEL, text=message)
-
-def upload_chart_to_slack(file_path, title, explanation):
-    client = WebClient(token=SLACK_BOT_TOKEN)
-    with open(file_path, "rb") as f:
-        client.files_upload_v2(
-            channel=SLACK_CHANNEL,
-            file=f,
-            filename=os.path.basename(file_path),
-            title=title,
-            initial_comment=explanation
-        )
+# === Graph rendering ===
+# auto: the full issue graph while it is small enough to read, otherwise collapsed by component
+GRAPH_MODE = os.getenv("DEPENDENCY_GRAPH_MODE", "auto")  # auto | full | components | chains
+TOP_CHAINS = int(os.getenv("DEPENDENCY_TOP_CHAINS", "5"))
+# Link types that mean "can't start until the other is done"; Relates, Cloners, Duplicate etc. stay CSV-only
+BLOCKING_LINK_TYPES = [t.strip() for t in os.getenv("DEPENDENCY_BLOCKING_LINK_TYPES", "Blocks").split(",") if t.strip()]
+MAX_DRAWN_NODES = 150
+LAYOUT_ITERATIONS = 50
 
-# === Get All Issues in CLP Project ===
+# === Get All Issues in CLP Project (non-Done, from the local issue cache) ===
 def get_all_issues():
-    start = 0
-    max_results = 100
-    all_issues = []
+    return project_issues()
 
-    while True:
-        jql = f'project = {PROJECT_KEY} AND statusCategory != Done'
-        url = f"{JIRA_DOMAIN}/rest/api/3/search?jql={jql}&fields=key,status,issuelinks,components&startAt={start}&maxResults={max_results}"
-        response = requests.get(url, headers=HEADERS)
-        data = response.json()
-        issues = data.get("issues", [])
-        all_issues.extend(issues)
-        if len(issues) < max_results:
+# === Graph views ===
+def component_graph(graph, component_of):
+    # One node per component, edges weighted by how many issue links cross between them
+    collapsed = nx.DiGraph()
+    for node in graph:
+        component = component_of.get(node, "None")
+        collapsed.add_node(component, issues=collapsed.nodes.get(component, {}).get("issues", 0) + 1)
+    for a, b in graph.edges():
+        ca, cb = component_of.get(a, "None"), component_of.get(b, "None")
+        weight = collapsed.get_edge_data(ca, cb, {}).get("weight", 0)
+        collapsed.add_edge(ca, cb, weight=weight + 1)
+    return collapsed
+
+def largest_chains(graph, top_n, max_nodes=MAX_DRAWN_NODES):
+    # The N biggest weakly connected blocking chains, trimmed to the drawing budget
+    keep = set()
+    for chain in sorted(nx.weakly_connected_components(graph), key=len, reverse=True)[:top_n]:
+        if keep and len(keep) + len(chain) > max_nodes:
             break
-        start += max_results
+        keep |= chain
+    if len(keep) > max_nodes:
+        busiest = sorted(graph.degree(keep), key=lambda d: -d[1])[:max_nodes]
+        keep = {node for node, _ in busiest}
+    return graph.subgraph(keep)
 
-    return all_issues
+def resolve_mode(graph, mode):
+    # spring_layout only ever sees a capped graph: "full" past MAX_DRAWN_NODES falls back like "auto"
+    if mode in ("auto", "full") and graph.number_of_nodes() > MAX_DRAWN_NODES:
+        if mode == "full":
+            print(f"⚠️ {graph.number_of_nodes()} issues is too many to lay out in full (max {MAX_DRAWN_NODES}); drawing by component")
+        return "components"
+    return "full" if mode == "auto" else mode
 
-# === Build the Report ===
-def build_report():
-    all_issues = get_all_issues()
-    rows = []
-    graph = nx.DiGraph()
+def draw_graph(graph, component_of, mode, top_chains):
+    # Rendered by charts.render; `mode` is already resolved
+    import matplotlib.pyplot as plt
 
-    for issue in all_issues:
-        key = issue["key"]
-        status = issue["fields"]["status"]["name"]
-        components = issue["fields"].get("components", [])
-        component = components[0]["name"] if components else "None"
-        links = issue["fields"].get("issuelinks", [])
+    plt.figure(figsize=(14, 10))
+    if mode == "components":
+        collapsed = component_graph(graph, component_of)
+        pos = nx.circular_layout(collapsed)
+        weights = nx.get_edge_attributes(collapsed, "weight")
+        heaviest = max(weights.values(), default=1)
+        sizes = [min(6000, 600 + 100 * collapsed.nodes[n]["issues"] ** 0.5) for n in collapsed]
+        nx.draw(
+            collapsed, pos, with_labels=True, arrows=True, node_size=sizes, node_color="lightblue",
+            font_size=10, width=[1 + 5 * weights[e] / heaviest for e in collapsed.edges()]
+        )
+        nx.draw_networkx_edge_labels(collapsed, pos, edge_labels=weights, font_size=8)
+        title = f"CLP Dependencies by Component ({graph.number_of_nodes()} issues, {graph.number_of_edges()} links)"
+    else:
+        shown = largest_chains(graph, top_chains) if mode == "chains" else graph
+        # Fixed seed and iteration budget keep the layout deterministic and bounded
+        pos = nx.spring_layout(shown, k=0.4, iterations=LAYOUT_ITERATIONS, seed=42)
+        nx.draw(shown, pos, with_labels=True, arrows=True, node_size=500, node_color="lightblue", font_size=8)
+        title = "CLP Dependency Graph" if mode == "full" else f"CLP Dependency Graph (top {top_chains} blocking chains)"
+    plt.title(title)
+    plt.tight_layout()
 
-        for link in links:
-            direction = None
-            linked = None
-            if "inwardIssue" in link:
-                direction = "depends on"
-                linked = link["inwardIssue"]
-            elif "outwardIssue" in link:
-                direction = "blocks"
-                linked = link["outwardIssue"]
-            if linked:
-                dep_key = linked["key"]
-                dep_status = linked["fields"]["status"]["name"]
-                dep_components = linked["fields"].get("components", [])
-                dep_component = dep_components[0]["name"] if dep_components else "None"
-                rows.append({
-                    "Issue": key,
-                    "Status": status,
-                    "Component": component,
-                    "Depends On": dep_key,
-                    "Dependency Status": dep_status,
-                    "Dependency Component": dep_component
-                })
-                graph.add_edge(key, dep_key)
+# === Build the Report ===
+def build_report(graph_mode=GRAPH_MODE, top_chains=TOP_CHAINS, csv_only=False):
+    # Each link is stored once, pointing blocker -> blocked, whichever side reported it
+    store = EdgeStore()
+    for issue in get_all_issues():
+        store.add_issue(issue)
+    # Link stubs carry no components; look the outside issues up in batches (cached between runs)
+    store.fill(linked_issues(store.external_keys()))
+    # Chains, cycles and the drawn graph follow blocking links only; the CSV lists every link type
+    graph = store.to_graph(BLOCKING_LINK_TYPES)
+    component_of = store.component_map()
 
     # === Save CSV with explanation
-    df = pd.DataFrame(rows)
+    df = pd.DataFrame(list(store.rows()), columns=[
+        "Issue", "Status", "Component", "Depends On", "Dependency Status", "Dependency Component", "Link Type"
+    ])
+    digest = fingerprint(df, graph_mode, str(top_chains), ",".join(BLOCKING_LINK_TYPES))
+    if unchanged("dependencies", digest):
+        return
     df.to_csv(CSV_PATH, index=False)
     with open(CSV_PATH, "a") as f:
         f.write("\n---\n")
         f.write("Explanation: This report maps issue-to-issue dependencies across the CLP project.\n")
-        f.write("Only non-Done issues are included. Dependencies include 'blocks' and 'is blocked by' links.\n")
+        f.write("Only non-Done issues are included. Each link appears once: 'Issue' depends on 'Depends On' (e.g. is blocked by it).\n")
         f.write("Used to identify chain-of-blockage and cross-team blockers.\n")
 
+    # === Blocker analytics: what unblocks the most work
+    analysis = analyze_blockers(graph, component_of)
+    blockers = pd.DataFrame([{
+        "Issue": key,
+        "Component": component_of.get(key, "None"),
+        "Downstream Blocked": count,
+        "Cross-Component Blocked": analysis["cross_component"].get(key, 0)
+    } for key, count in analysis["downstream"].items()])
+    if not blockers.empty:
+        blockers = blockers.sort_values(["Downstream Blocked", "Issue"], ascending=[False, True])
+    blockers.to_csv(ANALYSIS_CSV_PATH, index=False)
+    print(f"🧠 Blocker analysis: {analysis['blocks']} blocks ({analysis['recomputed']} recomputed), {len(analysis['cycles'])} cycles")
+    if csv_only:
+        return
+    top_lines = "\n".join(f"• {key} blocks {count} issue(s) downstream" for key, count in analysis["top_unblockers"][:5])
+    longest = analysis["longest_chains"][0] if analysis["longest_chains"] else []
+
     # === Draw Graph
-    plt.figure(figsize=(14, 10))
-    pos = nx.spring_layout(graph, k=0.4)
-    nx.draw(graph, pos, with_labels=True, arrows=True, node_size=500, node_color="lightblue", font_size=8)
-    plt.title("CLP Dependency Graph")
-    plt.tight_layout()
-    plt.savefig(CHART_PATH)
-    plt.close()
+    drawn_mode = resolve_mode(graph, graph_mode)
+    [chart] = render([(draw_graph, (graph, component_of, drawn_mode, top_chains), CHART_PATH)])
 
     # === Post to Slack
-    post_to_slack("*🔗 CLP Dependency Status Report*\nSee which issues are currently blocked by others.")
-    upload_chart_to_slack(
-        CHART_PATH,
-        "CLP Issue Dependency Graph",
-        "This network graph shows issue-to-issue dependencies (directional). Only active dependencies are shown."
+    if drawn_mode == "components":
+        explanation = "Dependencies collapsed by component. Edge labels count the issue links between teams."
+    else:
+        explanation = "This network graph shows issue-to-issue dependencies (directional). Only active dependencies are shown."
+    post = publish(
+        "*🔗 CLP Dependency Status Report*\nSee which issues are currently blocked by others.\n"
+        + (f"*Unblocks the most work:*\n{top_lines}\n" if top_lines else "")
+        + (f"*Longest blocking chain ({len(longest)}):* {' → '.join(longest[:12])}{' …' if len(longest) > 12 else ''}\n" if longest else "")
+        + (f"⚠️ {len(analysis['cycles'])} dependency cycle(s) found\n" if analysis["cycles"] else "")
+        + explanation,
+        [(chart, "CLP Issue Dependency Graph")]
     )
+    record("dependencies", digest, post)
 
 # === Run
 if __name__ == "__main__":
-    build_report()
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--snapshot", help="Build from a snapshot file (see snapshot.py) instead of calling Jira")
+    parser.add_argument("--graph-mode", choices=["auto", "full", "components", "chains"], default=GRAPH_MODE)
+    parser.add_argument("--top-chains", type=int, default=TOP_CHAINS, help="Chains drawn in --graph-mode chains")
+    parser.add_argument("--csv-only", action="store_true", help="Write the CSVs only: no graph, no Slack")
+    parser.add_argument("--no-slack", action="store_true", help="Build everything but don't post to Slack")
+    args = parser.parse_args()
+    if args.snapshot:
+        load_snapshot(args.snapshot)
+    if args.no_slack or args.csv_only:
+        disable_slack()
+    build_report(args.graph_mode, args.top_chains, args.csv_only)
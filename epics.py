@@ -0,0 +1,55 @@
+# EPICS
+# Epic lookups shared by the slipped-by-epic scripts: which epics to report on, and every
+# story under them in one paginated search instead of one capped search per epic.
+
+import os
+from jira_client import search_issues, chunked
+
+JIRA_PROJECT = os.getenv("JIRA_PROJECT_KEY", "CLP")
+EPIC_LINK_FIELD = "customfield_10005"
+# Comma-separated epic keys, or "active" for every epic that isn't Done
+EPIC_KEYS = os.getenv("SLIPPED_EPIC_KEYS", "CLP-75,CLP-112,CLP-840")
+STORY_FIELDS = f"summary,assignee,components,{EPIC_LINK_FIELD},parent"
+# Keeps the `in (...)` lists (and so the request URL) a sane length for hundreds of epics
+EPIC_BATCH = 100
+
+# === Epic list ===
+def active_epics():
+    jql = f"project = {JIRA_PROJECT} AND issuetype = Epic AND statusCategory != Done"
+    return [issue["key"] for issue in search_issues(jql, "key")]
+
+def resolve_epics(value=None):
+    value = (value or EPIC_KEYS).strip()
+    if value.lower() == "active":
+        return active_epics()
+    return [key.strip().upper() for key in value.split(",") if key.strip()]
+
+# === Epic for one issue: Epic Link, else the Epic parent (team-managed projects) ===
+def get_epic_link(fields):
+    epic_key = fields.get(EPIC_LINK_FIELD)
+    if epic_key:
+        return epic_key
+    parent = fields.get("parent") or {}
+    if parent.get("fields", {}).get("issuetype", {}).get("name") == "Epic":
+        return parent.get("key")
+    return None
+
+# === Stories under the epics ===
+def stories_under_epics(epic_keys):
+    # Streams one row per story; the epic is read off each story rather than implied by the query
+    wanted = set(epic_keys)
+    for batch in chunked(epic_keys, EPIC_BATCH):
+        keys = ",".join(batch)
+        jql = f'project = {JIRA_PROJECT} AND issuetype = Story AND ("Epic Link" in ({keys}) OR parent in ({keys}))'
+        for issue in search_issues(jql, STORY_FIELDS):
+            fields = issue["fields"]
+            epic = get_epic_link(fields)
+            if epic not in wanted:
+                continue
+            yield {
+                "key": issue["key"],
+                "summary": fields.get("summary"),
+                "assignee": fields["assignee"]["displayName"] if fields.get("assignee") else "Unassigned",
+                "component": ", ".join(c["name"] for c in fields.get("components") or []),
+                "epic": epic
+            }
@@ -0,0 +1,163 @@
+# ISSUE CACHE
+# Local SQLite store of project issues, refreshed incrementally with `updated >= last_sync`
+
+import os
+import json
+import sqlite3
+import threading
+from datetime import datetime, timedelta
+from jira_client import CACHE_DIR, search_issues, search_keys
+
+PROJECT_KEY = os.getenv("JIRA_PROJECT_KEY", "CLP")
+DB_PATH = os.path.join(CACHE_DIR, "issues.sqlite")
+
+# Union of the fields every report reads from the store
+ISSUE_FIELDS = "key,summary,status,issuetype,components,issuelinks,customfield_10020,updated"
+ISSUE_EXPAND = "changelog"
+
+# Re-read the changed window with some slack, and do a full refresh now and then to drop deleted issues
+SYNC_OVERLAP = timedelta(minutes=5)
+FULL_SYNC_DAYS = int(os.getenv("ISSUE_CACHE_FULL_SYNC_DAYS", "7"))
+
+# Linked issues outside the synced set (Done or other projects) only need status + component
+LINKED_FIELDS = "status,components"
+LINKED_TTL = timedelta(hours=int(os.getenv("LINKED_ISSUE_CACHE_HOURS", "12")))
+LINKED_BATCH = 100
+
+_synced = False
+_sync_lock = threading.Lock()
+
+# === Storage ===
+def connect():
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    conn = sqlite3.connect(DB_PATH)
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS issues ("
+        "key TEXT PRIMARY KEY, updated TEXT, issuetype TEXT, status_category TEXT, data TEXT)"
+    )
+    conn.execute("CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value TEXT)")
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS linked ("
+        "key TEXT PRIMARY KEY, status TEXT, component TEXT, fetched_at TEXT)"
+    )
+    return conn
+
+def get_meta(conn, name):
+    row = conn.execute("SELECT value FROM meta WHERE name = ?", (name,)).fetchone()
+    return row[0] if row else None
+
+def set_meta(conn, name, value):
+    conn.execute("INSERT OR REPLACE INTO meta VALUES (?, ?)", (name, value))
+
+def store_issue(conn, issue):
+    fields = issue["fields"]
+    conn.execute(
+        "INSERT OR REPLACE INTO issues VALUES (?, ?, ?, ?, ?)",
+        (
+            issue["key"],
+            fields.get("updated", ""),
+            fields.get("issuetype", {}).get("name", ""),
+            fields.get("status", {}).get("statusCategory", {}).get("key", ""),
+            json.dumps(issue)
+        )
+    )
+
+# === Sync ===
+def jql_timestamp(updated):
+    # Jira returns `updated` in the API user's timezone, which is also the zone JQL dates are read in
+    ts = datetime.strptime(updated[:19], "%Y-%m-%dT%H:%M:%S") - SYNC_OVERLAP
+    return ts.strftime("%Y/%m/%d %H:%M")
+
+def needs_full_sync(conn):
+    if get_meta(conn, "fields") != f"{ISSUE_FIELDS}|{ISSUE_EXPAND}" or not get_meta(conn, "last_sync"):
+        return True
+    full_sync_at = datetime.fromisoformat(get_meta(conn, "full_sync_at"))
+    return datetime.now() - full_sync_at > timedelta(days=FULL_SYNC_DAYS)
+
+def sync():
+    conn = connect()
+    full = needs_full_sync(conn)
+    if full:
+        # Done issues only matter once they change, so a full load starts from the open ones
+        jql = f"project = {PROJECT_KEY} AND statusCategory != Done"
+    else:
+        jql = f'project = {PROJECT_KEY} AND updated >= "{jql_timestamp(get_meta(conn, "last_sync"))}"'
+
+    newest = None if full else get_meta(conn, "last_sync")
+    fetched = 0
+    with conn:
+        if full:
+            conn.execute("DELETE FROM issues")
+        for issue in search_issues(jql, ISSUE_FIELDS, expand=ISSUE_EXPAND):
+            store_issue(conn, issue)
+            newest = max(newest or "", issue["fields"].get("updated", ""))
+            fetched += 1
+        if newest:
+            set_meta(conn, "last_sync", newest)
+        if full:
+            set_meta(conn, "fields", f"{ISSUE_FIELDS}|{ISSUE_EXPAND}")
+            set_meta(conn, "full_sync_at", datetime.now().isoformat())
+    conn.close()
+    print(f"🗄️ Issue cache: {fetched} issue(s) pulled ({'full' if full else 'incremental'} sync)")
+
+# === Read ===
+def load_issues(issuetype=None, include_done=False):
+    # Yields issues straight off the cursor so callers never hold the whole project
+    conn = connect()
+    query = "SELECT data FROM issues WHERE 1 = 1"
+    args = []
+    if issuetype:
+        query += " AND issuetype = ?"
+        args.append(issuetype)
+    if not include_done:
+        query += " AND status_category != 'done'"
+    try:
+        for (data,) in conn.execute(query + " ORDER BY key", args):
+            yield json.loads(data)
+    finally:
+        conn.close()
+
+def project_issues(issuetype=None, include_done=False):
+    # Sync once per process so several reports in one run share the refresh
+    global _synced
+    with _sync_lock:
+        if not _synced:
+            sync()
+            _synced = True
+    return load_issues(issuetype, include_done)
+
+# === Linked issue details ===
+def summarize(fields):
+    components = fields.get("components") or []
+    return {
+        "status": fields.get("status", {}).get("name"),
+        "component": components[0]["name"] if components else "None"
+    }
+
+def linked_details(keys):
+    # key -> {"status", "component"}: synced issues first, then the linked cache,
+    # then one `key in (...)` search per LINKED_BATCH keys that are still unknown or stale
+    conn = connect()
+    details, missing = {}, []
+    fresh_after = (datetime.now() - LINKED_TTL).isoformat()
+    for key in keys:
+        row = conn.execute("SELECT data FROM issues WHERE key = ?", (key,)).fetchone()
+        if row:
+            details[key] = summarize(json.loads(row[0])["fields"])
+            continue
+        row = conn.execute("SELECT status, component FROM linked WHERE key = ? AND fetched_at > ?", (key, fresh_after)).fetchone()
+        if row:
+            details[key] = {"status": row[0], "component": row[1]}
+        else:
+            missing.append(key)
+
+    now = datetime.now().isoformat()
+    with conn:
+        for issue in search_keys(missing, LINKED_FIELDS, LINKED_BATCH):
+            found = summarize(issue["fields"])
+            details[issue["key"]] = found
+            conn.execute("INSERT OR REPLACE INTO linked VALUES (?, ?, ?, ?)", (issue["key"], found["status"], found["component"], now))
+    conn.close()
+    if missing:
+        print(f"🔗 Linked issues: {len(keys) - len(missing)} cached, {len(missing)} fetched in {-(-len(missing) // LINKED_BATCH)} batch(es)")
+    return details
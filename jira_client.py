@@ -0,0 +1,145 @@
+# SHARED JIRA CLIENT
+# One pooled keep-alive session for every report, with retries and 429 / Retry-After backoff
+
+import os
+import base64
+import threading
+import requests
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from dotenv import load_dotenv
+import tracing
+
+# === Load .env ===
+load_dotenv()
+EMAIL = os.getenv("EMAIL") or os.getenv("JIRA_EMAIL")
+API_TOKEN = os.getenv("API_TOKEN") or os.getenv("JIRA_API_TOKEN")
+JIRA_DOMAIN = os.getenv("JIRA_DOMAIN")
+
+# === Connection tuning ===
+POOL_SIZE = int(os.getenv("JIRA_POOL_SIZE", "10"))
+MAX_RETRIES = int(os.getenv("JIRA_MAX_RETRIES", "5"))
+BACKOFF_FACTOR = float(os.getenv("JIRA_BACKOFF_FACTOR", "1"))
+TIMEOUT = float(os.getenv("JIRA_TIMEOUT", "30"))
+MAX_IN_FLIGHT = int(os.getenv("JIRA_MAX_IN_FLIGHT", "8"))
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+# === Local cache ===
+CACHE_DIR = os.getenv("SPRINTWATCH_CACHE_DIR", ".sprintwatch_cache")
+
+# === Jira auth headers ===
+HEADERS = {
+    "Accept": "application/json",
+    "Authorization": f"Basic {base64.b64encode(f'{EMAIL}:{API_TOKEN}'.encode()).decode()}"
+}
+
+_session = None
+_session_lock = threading.Lock()
+# Caps concurrent Jira calls across every thread so fan-out stays under the rate limit
+_in_flight = threading.BoundedSemaphore(MAX_IN_FLIGHT)
+
+# === Session ===
+def get_session():
+    global _session
+    with _session_lock:
+        if _session is None:
+            # Retry-After is honored on 429/503; everything else backs off exponentially
+            retry = Retry(
+                total=MAX_RETRIES,
+                backoff_factor=BACKOFF_FACTOR,
+                status_forcelist=RETRY_STATUSES,
+                respect_retry_after_header=True,
+                raise_on_status=False
+            )
+            adapter = HTTPAdapter(pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE, max_retries=retry)
+            session = requests.Session()
+            session.headers.update(HEADERS)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _session = session
+    return _session
+
+# === Requests ===
+def jira_get(path, params=None):
+    url = path if path.startswith("http") else f"{JIRA_DOMAIN}{path}"
+    with _in_flight:
+        if tracing.ENABLED:
+            return tracing.trace_jira(lambda: get_session().get(url, params=params, timeout=TIMEOUT), url)
+        return get_session().get(url, params=params, timeout=TIMEOUT)
+
+def get_json(path, params=None):
+    r = jira_get(path, params)
+    r.raise_for_status()
+    return r.json()
+
+def search_issues(jql, fields, expand=None, page_size=100, params=None):
+    # Streams /search/jql by nextPageToken. The next page is requested in the background while
+    # the caller works through the current one, so at most one page is held plus one in flight.
+    query = {"jql": jql, "fields": fields, "maxResults": page_size}
+    if expand:
+        query["expand"] = expand
+    query.update(params or {})
+    with ThreadPoolExecutor(max_workers=1) as prefetch:
+        pending = prefetch.submit(get_json, "/rest/api/3/search/jql", query)
+        while pending:
+            data = pending.result()
+            token = data.get("nextPageToken")
+            pending = None
+            if token and not data.get("isLast", False):
+                pending = prefetch.submit(get_json, "/rest/api/3/search/jql", {**query, "nextPageToken": token})
+            yield from data.get("issues", [])
+
+def search_keys(keys, fields, batch_size=100, expand=None):
+    # Batched `key in (...)` searches. Jira answers 400 for the whole batch when one key is deleted,
+    # moved or not visible to us, so a rejected batch is split in half until the bad keys are isolated
+    # and skipped; every other key still resolves.
+    for batch in chunked(keys, batch_size):
+        yield from search_key_batch(batch, fields, expand)
+
+def search_key_batch(batch, fields, expand=None):
+    try:
+        issues = list(search_issues(f"key in ({','.join(batch)})", fields, expand=expand, page_size=len(batch)))
+    except requests.HTTPError as e:
+        if e.response is None or e.response.status_code != 400:
+            raise
+        if len(batch) == 1:
+            print(f"⚠️ Skipping {batch[0]}: Jira rejected it ({e.response.status_code})")
+            return
+        middle = len(batch) // 2
+        yield from search_key_batch(batch[:middle], fields, expand)
+        yield from search_key_batch(batch[middle:], fields, expand)
+        return
+    yield from issues
+
+def iter_pages(path, params, items_key, page_size=100):
+    # Streams a startAt/total paged endpoint; once the first page reveals the total,
+    # the rest are fetched MAX_IN_FLIGHT pages at a time and yielded in order
+    first = get_json(path, {**params, "startAt": 0, "maxResults": page_size})
+    items = first.get(items_key, [])
+    yield from items
+    step = first.get("maxResults") or page_size
+    if not items or first.get("total", 0) <= step:
+        return
+
+    def fetch_page(start_at):
+        return get_json(path, {**params, "startAt": start_at, "maxResults": step}).get(items_key, [])
+
+    for window in chunked(range(step, first["total"], step), MAX_IN_FLIGHT):
+        for page in map_concurrent(fetch_page, window):
+            yield from page
+
+def chunked(items, size):
+    items = list(items)
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+# === Concurrency ===
+def map_concurrent(fn, items, max_workers=None):
+    # Results come back in input order; the semaphore above bounds the real HTTP fan-out
+    items = list(items)
+    workers = min(max_workers or MAX_IN_FLIGHT, len(items))
+    if workers <= 1:
+        return [fn(item) for item in items]
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(fn, items))
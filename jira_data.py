@@ -0,0 +1,113 @@
+# JIRA DATA
+# Board, sprint and issue lookups shared by the reports.
+# Every result is memoized per run; with a snapshot loaded the lookups never touch the network.
+
+import os
+import threading
+from collections import defaultdict
+from jira_client import get_json, iter_pages, search_keys
+from issue_cache import project_issues as cached_project_issues, linked_details, ISSUE_FIELDS, ISSUE_EXPAND
+from sprint_index import closed_sprints as indexed_closed_sprints
+
+STORY_POINTS_FIELD = os.getenv("STORY_POINTS_FIELD")
+# Union of the sprint-issue fields the velocity and readiness numbers need
+SPRINT_ISSUE_FIELDS = ",".join(f for f in ["status", STORY_POINTS_FIELD] if f)
+
+_data = {}
+_offline = False
+_recording = False
+# One lock per lookup so concurrent callers asking for the same thing share a single fetch
+_locks = defaultdict(threading.Lock)
+_locks_guard = threading.Lock()
+
+# === Memo / snapshot plumbing ===
+def _lookup(kind, key, fetch):
+    key = str(key)
+    with _locks_guard:
+        bucket = _data.setdefault(kind, {})
+        lock = _locks[(kind, key)]
+    with lock:
+        if key not in bucket:
+            if _offline:
+                raise LookupError(f"{kind}[{key}] is not in the loaded snapshot")
+            bucket[key] = fetch()
+    return bucket[key]
+
+def use_snapshot(data):
+    global _data, _offline
+    _data = data
+    _offline = True
+
+def start_recording():
+    # Streamed lookups keep their full results only while a snapshot is being taken
+    global _recording
+    _recording = True
+
+def collected():
+    return _data
+
+# === Boards & sprints ===
+def closed_sprints(board_id):
+    # Full closed-sprint history, oldest first, kept current by the on-disk sprint index
+    return _lookup("closed_sprints", board_id, lambda: indexed_closed_sprints(board_id))
+
+def last_closed_sprints(board_id, n):
+    return closed_sprints(board_id)[-n:]
+
+def active_sprints(board_id):
+    return _lookup("active_sprints", board_id, lambda: get_json(
+        f"/rest/agile/1.0/board/{board_id}/sprint", {"state": "active"}
+    ).get("values", []))
+
+def sprint_report(board_id, sprint_id):
+    return _lookup("sprint_reports", f"{board_id}:{sprint_id}", lambda: get_json(
+        "/rest/greenhopper/1.0/rapid/charts/sprintreport",
+        {"rapidViewId": board_id, "sprintId": sprint_id}
+    ).get("contents", {}))
+
+def stream_sprint_issues(sprint_id):
+    return iter_pages(f"/rest/agile/1.0/sprint/{sprint_id}/issue", {"fields": SPRINT_ISSUE_FIELDS}, "issues")
+
+def sprint_issues(sprint_id):
+    # A generator over every page of the sprint, holding one window of pages at a time
+    if _offline or _recording:
+        return iter(_lookup("sprint_issues", sprint_id, lambda: list(stream_sprint_issues(sprint_id))))
+    return stream_sprint_issues(sprint_id)
+
+# === Project issues ===
+def issue_matches(issue, issuetype, include_done):
+    fields = issue["fields"]
+    if issuetype and fields.get("issuetype", {}).get("name") != issuetype:
+        return False
+    return include_done or fields.get("status", {}).get("statusCategory", {}).get("key") != "done"
+
+def project_issues(issuetype=None, include_done=False):
+    # Streams from the issue cache; the full list is only materialized for snapshots
+    if _offline or _recording:
+        issues = _lookup("issues", "all", lambda: list(cached_project_issues(include_done=True)))
+        return (issue for issue in issues if issue_matches(issue, issuetype, include_done))
+    return cached_project_issues(issuetype, include_done)
+
+def linked_issues(keys):
+    # Status + component for issues that are only known from link stubs
+    if not (_offline or _recording):
+        return linked_details(keys)
+    bucket = _data.setdefault("linked", {})
+    if not _offline:
+        bucket.update(linked_details([key for key in keys if key not in bucket]))
+    return {key: bucket[key] for key in keys if key in bucket}
+
+def issues_by_key(keys):
+    # Full issues (inline changelog included) for keys outside the issue cache, e.g. Done stories
+    # in the closed sprints a report looks at; fetched in batched `key in (...)` searches
+    if not (_offline or _recording):
+        return list(search_keys(keys, ISSUE_FIELDS, expand=ISSUE_EXPAND))
+    bucket = _data.setdefault("issues_by_key", {})
+    if not _offline:
+        for issue in search_keys([key for key in keys if key not in bucket], ISSUE_FIELDS, expand=ISSUE_EXPAND):
+            bucket[issue["key"]] = issue
+    return [bucket[key] for key in keys if key in bucket]
+
+def issue_changelog(key):
+    # Full changelog history, for issues whose inline (search) changelog was truncated
+    return _lookup("changelogs", key, lambda: list(iter_pages(f"/rest/api/3/issue/{key}/changelog", {}, "values")))
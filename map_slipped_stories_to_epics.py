@@ -1,44 +1,38 @@
 import os
-import base64
-import pandas as pd
-import requests
-from dotenv import load_dotenv
+from jira_client import search_issues, search_keys
+from epics import JIRA_PROJECT, EPIC_LINK_FIELD, get_epic_link
+from slip_index import slipped
 
-# === Load credentials ===
-load_dotenv()
-EMAIL = os.getenv("EMAIL")
-API_TOKEN = os.getenv("API_TOKEN")
-JIRA_DOMAIN = os.getenv("JIRA_DOMAIN")
-
-HEADERS = {
-    "Accept": "application/json",
-    "Authorization": f"Basic {base64.b64encode(f'{EMAIL}:{API_TOKEN}'.encode()).decode()}"
-}
+BATCH_SIZE = 100
+# Stories that were in a sprint and changed in this window; Done ones are indexed on demand
+SLIP_LOOKBACK_DAYS = int(os.getenv("SLIP_LOOKBACK_DAYS", "180"))
+OUTPUT_COLUMNS = ["key", "summary", "component", "times_moved", "last_moved", "epic"]
 
 # === Load slipped stories ===
-slipped_path = "/Users/jameslogan/Documents/clean_sprint_watchdog/sprint_watchdog_filtered_slips.csv"
-slipped_df = pd.read_csv(slipped_path)
-slipped_keys = slipped_df["key"].dropna().tolist()
+jql = f"project = {JIRA_PROJECT} AND issuetype = Story AND sprint is not EMPTY AND updated >= -{SLIP_LOOKBACK_DAYS}d"
+story_keys = [issue["key"] for issue in search_issues(jql, "key")]
+slipped_df = slipped("Story", keys=story_keys).reset_index()
+slipped_keys = slipped_df["key"].tolist()
 
-# === Function to get Epic Link for a given issue key ===
-def get_epic_link(issue_key):
-    url = f"{JIRA_DOMAIN}/rest/api/3/issue/{issue_key}?fields=summary,customfield_10005"
-    r = requests.get(url, headers=HEADERS)
-    if r.status_code == 200:
-        data = r.json()
-        return data["fields"].get("customfield_10005")  # Epic Link
-    return None
+# === Resolve summaries and Epic Links in batched `key in (...)` searches ===
+def get_epic_links(issue_keys):
+    summaries, epic_map = {}, {}
+    # A deleted/moved key is skipped rather than failing its whole batch
+    for issue in search_keys(issue_keys, f"summary,{EPIC_LINK_FIELD},parent", BATCH_SIZE):
+        key = issue["key"].upper()
+        summaries[key] = issue["fields"].get("summary")
+        epic_map[key] = get_epic_link(issue["fields"])
+    return summaries, epic_map
 
 # === Map epic links ===
-epic_map = {}
-for key in slipped_keys:
-    epic_key = get_epic_link(key)
-    epic_map[key] = epic_key if epic_key else "None"
+summaries, epic_map = get_epic_links(slipped_keys)
 
-# === Add Epic column to slipped_df ===
-slipped_df["epic"] = slipped_df["key"].map(epic_map)
+# === Add summary and Epic columns to slipped_df ===
+keys = slipped_df["key"].str.strip().str.upper()
+slipped_df["summary"] = keys.map(summaries)
+slipped_df["epic"] = keys.map(epic_map).fillna("None")
 
 # === Output for use in gauge charts and visuals ===
 output_path = "slipped_stories_with_epics.csv"
-slipped_df.to_csv(output_path, index=False)
+slipped_df[OUTPUT_COLUMNS].to_csv(output_path, index=False)
 print(f"✅ Epic mapping complete. Output saved to {output_path}")
@@ -0,0 +1,368 @@
+# MOCK JIRA
+# Local stand-in for the Jira endpoints the reports call, serving synthetic or recorded data.
+# Point any report at it with JIRA_DOMAIN=http://127.0.0.1:<port>; Slack Web API calls
+# are also answered under /api/ for a WebClient created with base_url=<url>/api/
+#
+#   python mock_jira.py --boards 50 --issues 5000 --latency 20 --rate-429 0.02
+#   python mock_jira.py --record-from https://yourco.atlassian.net --fixtures fixtures/jira.json
+#   python mock_jira.py --replay fixtures/jira.json
+
+import os
+import re
+import json
+import time
+import random
+import argparse
+import threading
+import requests
+from collections import Counter, defaultdict
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qsl, urlencode
+
+# Boards the reports have hard-coded; synthetic boards are appended after these
+REPORT_BOARDS = [251, 250, 448, 252, 514]
+COMPONENTS = ["Data Science", "Design", "Engineering - AI Ops", "Engineering - Platform", "Engineering - Product"]
+STORY_POINTS_FIELD = os.getenv("STORY_POINTS_FIELD") or "customfield_10016"
+SPRINT_FIELD = "customfield_10020"
+EPIC_LINK_FIELD = "customfield_10005"
+INLINE_CHANGELOG_LIMIT = 100
+ACTIVE_STATUSES = ["To Do", "Ready for Development", "In Progress", "In Review"]
+BASE_TIME = datetime(2026, 1, 5, 9, 0)
+
+# === Synthetic dataset ===
+def jira_time(ts):
+    return ts.strftime("%Y-%m-%dT%H:%M:%S.000+0000")
+
+def status_for(name):
+    category = "done" if name == "Done" else "new" if name in ("To Do", "Ready for Development") else "indeterminate"
+    return {"name": name, "statusCategory": {"key": category}}
+
+def build_dataset(boards=5, sprints=8, issues=500, links=1.0, epics=20, histories=5, seed=7):
+    rng = random.Random(seed)
+    board_ids = (REPORT_BOARDS + [1000 + i for i in range(max(0, boards - len(REPORT_BOARDS)))])[:boards]
+
+    board_sprints = {}
+    for b, board_id in enumerate(board_ids):
+        rows = []
+        for n in range(1, sprints + 2):
+            start = BASE_TIME + timedelta(weeks=2 * (n - 1))
+            rows.append({
+                "id": board_id * 1000 + n,
+                "name": f"Board {board_id} Sprint {n}",
+                "state": "closed" if n <= sprints else "active",
+                "startDate": jira_time(start),
+                "endDate": jira_time(start + timedelta(weeks=2)),
+                "completeDate": jira_time(start + timedelta(weeks=2)) if n <= sprints else None
+            })
+        board_sprints[board_id] = rows
+
+    epic_keys = [f"CLP-{i}" for i in range(1, epics + 1)]
+    all_issues = []
+    for i in range(1, issues + 1):
+        key = f"CLP-{i}"
+        is_epic = i <= epics
+        b = rng.randrange(len(board_ids))
+        sprint_rows = board_sprints[board_ids[b]]
+        first = rng.randrange(len(sprint_rows))
+        span = 1 if rng.random() < 0.7 else rng.randint(2, 3)
+        issue_sprints = sprint_rows[first:first + span]
+        last = issue_sprints[-1]
+        if last["state"] == "closed" and rng.random() < 0.8:
+            status = "Done"
+        else:
+            status = rng.choice(ACTIVE_STATUSES)
+        epic = None if is_epic or rng.random() < 0.2 else rng.choice(epic_keys)
+        updated = BASE_TIME + timedelta(minutes=rng.randrange(60 * 24 * 7 * 2 * (sprints + 1)))
+
+        history = []
+        for prev, nxt in zip(issue_sprints, issue_sprints[1:]):
+            history.append({
+                "id": str(len(history) + 1),
+                "created": nxt["startDate"],
+                "items": [{"field": "Sprint", "fromString": prev["name"], "toString": f"{prev['name']}, {nxt['name']}"}]
+            })
+        for h in range(histories):
+            history.append({
+                "id": str(len(history) + 1),
+                "created": jira_time(updated - timedelta(hours=h + 1)),
+                "items": [{"field": "status", "fromString": "To Do", "toString": status}]
+            })
+        history.sort(key=lambda row: row["created"])
+
+        fields = {
+            "summary": f"Synthetic {'epic' if is_epic else 'story'} {i}",
+            "status": status_for(status),
+            "issuetype": {"name": "Epic" if is_epic else rng.choice(["Story", "Story", "Story", "Bug", "Task"])},
+            "components": [{"name": COMPONENTS[b % len(COMPONENTS)]}] if rng.random() < 0.9 else [],
+            "assignee": {"displayName": f"Dev {rng.randrange(25)}"} if rng.random() < 0.8 else None,
+            SPRINT_FIELD: [{"id": s["id"], "name": s["name"], "state": s["state"]} for s in issue_sprints],
+            EPIC_LINK_FIELD: epic,
+            "parent": {"key": epic, "fields": {"issuetype": {"name": "Epic"}}} if epic else None,
+            STORY_POINTS_FIELD: rng.choice([1, 2, 3, 5, 8, None]),
+            "issuelinks": [],
+            "updated": jira_time(updated)
+        }
+        all_issues.append({"id": str(i), "key": key, "fields": fields, "changelog": history})
+
+    # "A blocks B" shows up on both issues, as in Jira
+    stub = lambda issue: {"key": issue["key"], "fields": {"status": issue["fields"]["status"]}}
+    for _ in range(int(issues * links)):
+        a, b = rng.sample(all_issues, 2)
+        link_type = {"name": "Blocks", "inward": "is blocked by", "outward": "blocks"}
+        a["fields"]["issuelinks"].append({"type": link_type, "outwardIssue": stub(b)})
+        b["fields"]["issuelinks"].append({"type": link_type, "inwardIssue": stub(a)})
+
+    return {"board_sprints": board_sprints, "issues": all_issues}
+
+# === JQL (just enough for the queries the reports send) ===
+def parse_key_list(text):
+    return [k.strip().strip('"').upper() for k in text.split(",") if k.strip()]
+
+def jql_filter(jql):
+    checks = []
+    for m in re.finditer(r'\bkey\s+in\s*\(([^)]*)\)', jql, re.I):
+        keys = set(parse_key_list(m.group(1)))
+        checks.append(lambda issue, keys=keys: issue["key"] in keys)
+    epic_sets = [set(parse_key_list(m.group(1))) for m in re.finditer(r'(?:"Epic Link"|parent)\s+in\s*\(([^)]*)\)', jql, re.I)]
+    epic_sets += [{m.group(1).upper()} for m in re.finditer(r'"Epic Link"\s*=\s*"?([\w-]+)', jql, re.I)]
+    if epic_sets:
+        epics = set().union(*epic_sets)
+        checks.append(lambda issue: (issue["fields"][EPIC_LINK_FIELD] or "") in epics)
+    m = re.search(r'\bissuetype\s*=\s*"?(\w+)', jql, re.I)
+    if m:
+        checks.append(lambda issue, t=m.group(1).lower(): issue["fields"]["issuetype"]["name"].lower() == t)
+    if re.search(r'statusCategory\s*!=\s*Done', jql, re.I):
+        checks.append(lambda issue: issue["fields"]["status"]["statusCategory"]["key"] != "done")
+    m = re.search(r'\bupdated\s*>=\s*"([^"]+)"', jql, re.I)
+    if m:
+        since = jira_time(datetime.strptime(m.group(1), "%Y/%m/%d %H:%M"))
+        checks.append(lambda issue: issue["fields"]["updated"] >= since)
+    return lambda issue: all(check(issue) for check in checks)
+
+def project(issue, fields, expand):
+    wanted = [f for f in (fields or "*all").split(",") if f]
+    body = {"id": issue["id"], "key": issue["key"]}
+    if "*all" in wanted or "*navigable" in wanted:
+        body["fields"] = dict(issue["fields"])
+    else:
+        body["fields"] = {f: issue["fields"].get(f) for f in wanted if f != "key"}
+    if "changelog" in (expand or ""):
+        histories = issue["changelog"]
+        body["changelog"] = {
+            "startAt": 0,
+            "maxResults": min(len(histories), INLINE_CHANGELOG_LIMIT),
+            "total": len(histories),
+            "histories": histories[:INLINE_CHANGELOG_LIMIT]
+        }
+    return body
+
+def page(items, query, default_size):
+    start = int(query.get("startAt", 0))
+    size = min(int(query.get("maxResults", default_size)), 100)
+    chunk = items[start:start + size]
+    return chunk, {"startAt": start, "maxResults": size, "total": len(items), "isLast": start + size >= len(items)}
+
+# === Request handling ===
+class MockJira:
+    def __init__(self, dataset=None, latency=0.0, rate_429=0.0, retry_after=1, seed=7,
+                 record_from=None, replay=None, fixtures=None):
+        self.data = dataset
+        self.latency = latency
+        self.rate_429 = rate_429
+        self.retry_after = retry_after
+        self.rng = random.Random(seed)
+        self.record_from = record_from
+        self.fixtures_path = fixtures or replay
+        self.fixtures = {}
+        if replay or (record_from and fixtures and os.path.exists(fixtures)):
+            with open(self.fixtures_path) as f:
+                self.fixtures = json.load(f)
+        self.replay = bool(replay)
+        self.lock = threading.Lock()
+        self.stats = Counter()
+        if dataset:
+            self.by_key = {issue["key"]: issue for issue in dataset["issues"]}
+            self.sprint_members = defaultdict(list)
+            for issue in dataset["issues"]:
+                for s in issue["fields"][SPRINT_FIELD]:
+                    self.sprint_members[s["id"]].append(issue)
+
+    def handle(self, method, path, query, headers):
+        # Returns (status, body, extra headers)
+        endpoint = re.sub(r"/(\d{2,}|[A-Z]+-\d+)(?=/|$)", "/{id}", path)
+        with self.lock:
+            self.stats[endpoint] += 1
+            throttled = self.rate_429 and self.rng.random() < self.rate_429
+        if self.latency:
+            time.sleep(self.latency)
+        if path == "/__mock/stats":
+            return 200, dict(self.stats), {}
+        if path.startswith(("/api/", "/upload/")):
+            return self.slack(path, headers)
+        if throttled:
+            return 429, {"errorMessages": ["Rate limit exceeded"]}, {"Retry-After": str(self.retry_after)}
+
+        fixture_key = f"{method} {path}?{urlencode(sorted(query.items()))}"
+        if self.replay:
+            if fixture_key not in self.fixtures:
+                return 404, {"errorMessages": [f"Not recorded: {fixture_key}"]}, {}
+            hit = self.fixtures[fixture_key]
+            return hit["status"], hit["body"], {}
+        if self.record_from:
+            upstream = requests.request(
+                method, f"{self.record_from.rstrip('/')}{path}", params=query, timeout=60,
+                headers={k: v for k, v in headers.items() if k.lower() in ("authorization", "accept")}
+            )
+            body = upstream.json() if upstream.content else {}
+            with self.lock:
+                self.fixtures[fixture_key] = {"status": upstream.status_code, "body": body}
+                with open(self.fixtures_path, "w") as f:
+                    json.dump(self.fixtures, f)
+            return upstream.status_code, body, {}
+        return self.synthetic(path, query)
+
+    def synthetic(self, path, query):
+        data = self.data
+        m = re.fullmatch(r"/rest/agile/1\.0/board/(\d+)/sprint", path)
+        if m:
+            states = query.get("state", "active,closed,future").split(",")
+            sprints = [s for s in data["board_sprints"].get(int(m.group(1)), []) if s["state"] in states]
+            chunk, meta = page(sprints, query, 50)
+            return 200, {**meta, "values": chunk}, {}
+
+        m = re.fullmatch(r"/rest/agile/1\.0/sprint/(\d+)/issue", path)
+        if m:
+            sprint_id = int(m.group(1))
+            members = [i for i in self.sprint_members[sprint_id] if i["fields"][SPRINT_FIELD][-1]["id"] == sprint_id]
+            chunk, meta = page(members, query, 50)
+            return 200, {**meta, "issues": [project(i, query.get("fields"), query.get("expand")) for i in chunk]}, {}
+
+        if path == "/rest/greenhopper/1.0/rapid/charts/sprintreport":
+            sprint_id = int(query.get("sprintId", 0))
+            completed, not_done = [], []
+            for issue in self.sprint_members[sprint_id]:
+                points = issue["fields"][STORY_POINTS_FIELD]
+                row = {"key": issue["key"], "estimateStatistic": {"statFieldValue": {"value": points} if points else {}}}
+                finished_here = issue["fields"][SPRINT_FIELD][-1]["id"] == sprint_id and issue["fields"]["status"]["name"] == "Done"
+                (completed if finished_here else not_done).append(row)
+            return 200, {"contents": {"completedIssues": completed, "issuesNotCompletedInCurrentSprint": not_done}}, {}
+
+        if path in ("/rest/api/3/search", "/rest/api/3/search/jql"):
+            # Like Jira, one unknown key in a `key in (...)` list rejects the whole query
+            for m in re.finditer(r'\bkey\s+in\s*\(([^)]*)\)', query.get("jql", ""), re.I):
+                unknown = [k for k in parse_key_list(m.group(1)) if k not in self.by_key]
+                if unknown:
+                    return 400, {"errorMessages": [f"An issue with key '{unknown[0]}' does not exist for field 'key'."]}, {}
+            matches = [i for i in data["issues"] if jql_filter(query.get("jql", ""))(i)]
+            if path.endswith("/jql"):
+                start = int(query.get("nextPageToken") or 0)
+                size = min(int(query.get("maxResults", 50)), 100)
+                chunk = matches[start:start + size]
+                more = start + size < len(matches)
+                body = {"issues": [project(i, query.get("fields"), query.get("expand")) for i in chunk], "isLast": not more}
+                if more:
+                    body["nextPageToken"] = str(start + size)
+                return 200, body, {}
+            chunk, meta = page(matches, query, 50)
+            return 200, {**meta, "issues": [project(i, query.get("fields"), query.get("expand")) for i in chunk]}, {}
+
+        m = re.fullmatch(r"/rest/api/3/issue/([\w-]+)/changelog", path)
+        if m and m.group(1).upper() in self.by_key:
+            chunk, meta = page(self.by_key[m.group(1).upper()]["changelog"], query, 100)
+            return 200, {**meta, "values": chunk}, {}
+
+        m = re.fullmatch(r"/rest/api/3/issue/([\w-]+)", path)
+        if m:
+            issue = self.by_key.get(m.group(1).upper())
+            if not issue:
+                return 404, {"errorMessages": ["Issue does not exist or you do not have permission to see it."]}, {}
+            return 200, project(issue, query.get("fields"), query.get("expand")), {}
+
+        if path == "/rest/api/3/field":
+            return 200, [
+                {"id": EPIC_LINK_FIELD, "name": "Epic Link"},
+                {"id": SPRINT_FIELD, "name": "Sprint"},
+                {"id": STORY_POINTS_FIELD, "name": "Story Points"}
+            ], {}
+        return 404, {"errorMessages": [f"No mock for {path}"]}, {}
+
+    # === Slack (so benchmarks can exercise the upload path offline) ===
+    def slack(self, path, headers):
+        method = path.rsplit("/", 1)[-1]
+        if method == "files.getUploadURLExternal":
+            with self.lock:
+                file_id = f"F{sum(self.stats.values())}"
+            return 200, {"ok": True, "file_id": file_id, "upload_url": f"http://{headers.get('Host')}/upload/{file_id}"}, {}
+        if method == "files.completeUploadExternal":
+            return 200, {"ok": True, "files": [{"id": "F0"}]}, {}
+        return 200, {"ok": True, "channel": "C0", "ts": f"{time.time():.6f}"}, {}
+
+def make_handler(mock):
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            self.respond("GET")
+
+        def do_POST(self):
+            # Only the Slack mock takes POSTs; the body is read and dropped
+            self.rfile.read(int(self.headers.get("Content-Length") or 0))
+            self.respond("POST")
+
+        def respond(self, method):
+            parts = urlsplit(self.path)
+            status, body, extra = mock.handle(method, parts.path, dict(parse_qsl(parts.query)), dict(self.headers))
+            payload = json.dumps(body).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            for name, value in extra.items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, *args):
+            pass
+    return Handler
+
+# === Server ===
+def start_server(mock, port=0):
+    # Runs in a daemon thread; returns the server and the base URL to use as JIRA_DOMAIN
+    server = ThreadingHTTPServer(("127.0.0.1", port), make_handler(mock))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+# === Entry Point ===
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local mock Jira for offline runs and benchmarks")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--boards", type=int, default=5)
+    parser.add_argument("--sprints", type=int, default=8, help="Closed sprints per board")
+    parser.add_argument("--issues", type=int, default=500)
+    parser.add_argument("--links", type=float, default=1.0, help="Blocks links per issue")
+    parser.add_argument("--epics", type=int, default=20)
+    parser.add_argument("--histories", type=int, default=5, help="Extra changelog entries per issue")
+    parser.add_argument("--latency", type=float, default=0.0, help="Per-request latency in ms")
+    parser.add_argument("--rate-429", type=float, default=0.0, help="Fraction of requests answered with 429")
+    parser.add_argument("--retry-after", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--record-from", help="Proxy to this Jira and record every response")
+    parser.add_argument("--replay", help="Serve responses recorded with --record-from")
+    parser.add_argument("--fixtures", default="fixtures/jira.json", help="Fixture file for --record-from")
+    args = parser.parse_args()
+
+    dataset = None
+    if not (args.record_from or args.replay):
+        dataset = build_dataset(args.boards, args.sprints, args.issues, args.links, args.epics, args.histories, args.seed)
+    if args.record_from:
+        os.makedirs(os.path.dirname(args.fixtures) or ".", exist_ok=True)
+    mock = MockJira(
+        dataset, latency=args.latency / 1000, rate_429=args.rate_429, retry_after=args.retry_after, seed=args.seed,
+        record_from=args.record_from, replay=args.replay, fixtures=args.fixtures
+    )
+    server, url = start_server(mock, args.port)
+    print(f"🧪 Mock Jira listening on {url} (JIRA_DOMAIN={url})")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
@@ -0,0 +1,66 @@
+# REPORT MANIFEST
+# Content hashes of each report's normalized inputs from the last run that posted to Slack.
+# A report whose inputs hash the same skips its CSVs, charts and Slack post, so quiet weeks
+# cost one Jira sync and nothing lands in the channel or the repo.
+# SPRINTWATCH_FORCE=1 (or `sprintwatch run --force`) rebuilds and reposts regardless.
+
+import os
+import json
+import pickle
+import hashlib
+from jira_client import CACHE_DIR
+
+MANIFEST_PATH = os.path.join(CACHE_DIR, "reports.json")
+FORCE = os.getenv("SPRINTWATCH_FORCE", "").lower() in ("1", "true", "yes")
+
+# === Hashing ===
+def fingerprint(*parts):
+    # DataFrames hash by content (row order and index included); anything else by its pickle
+    digest = hashlib.sha1()
+    for part in parts:
+        if isinstance(part, str):
+            digest.update(part.encode())
+        elif type(part).__name__ == "DataFrame":
+            import pandas as pd
+            digest.update(",".join(map(str, part.columns)).encode())
+            digest.update(pd.util.hash_pandas_object(part, index=True).to_numpy().tobytes())
+        else:
+            digest.update(pickle.dumps(part, protocol=4))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+# === Manifest ===
+def load_manifest():
+    try:
+        with open(MANIFEST_PATH) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def unchanged(report, digest):
+    if FORCE or load_manifest().get(report) != digest:
+        return False
+    print(f"💤 {report}: inputs unchanged since the last posted run; skipping CSV, charts and Slack")
+    return True
+
+def save(report, digest):
+    manifest = load_manifest()
+    manifest[report] = digest
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    with open(MANIFEST_PATH, "w") as f:
+        json.dump(manifest, f, indent=2)
+
+def record(report, digest, post=None):
+    # Only runs that actually post count: a --no-slack run must not suppress the next real post,
+    # and a queued post is only recorded once Slack accepted it
+    import slack_publisher
+    if not slack_publisher.ENABLED:
+        return
+    if post is None:
+        save(report, digest)
+        return
+
+    def saved_when_posted(done):
+        if done.exception() is None and done.result():
+            save(report, digest)
+    post.add_done_callback(saved_when_posted)
@@ -0,0 +1,98 @@
+# SLACK PUBLISHER
+# One WebClient for the whole process. Each publish() is one message with all of its files
+# attached, identical posts within a run are sent once, and sends happen on a background thread
+# so the next report can be computed while the previous one uploads. Slack 429s are retried
+# after the Retry-After the API returns. slack_sdk itself is only imported once something is sent.
+
+import os
+import atexit
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dotenv import load_dotenv
+
+load_dotenv()
+SLACK_BOT_TOKEN = os.getenv("SLACK_BOT_TOKEN")
+SLACK_CHANNEL = os.getenv("SLACK_CHANNEL_ID")
+# Override only to point at a local mock (see mock_jira.py)
+SLACK_API_URL = os.getenv("SLACK_API_URL", "https://slack.com/api/")
+RATE_LIMIT_RETRIES = int(os.getenv("SLACK_RATE_LIMIT_RETRIES", "3"))
+# SPRINTWATCH_NO_SLACK=1 (or --no-slack / --csv-only on the reports) turns posting off
+ENABLED = os.getenv("SPRINTWATCH_NO_SLACK", "").lower() not in ("1", "true", "yes")
+
+_client = None
+_client_lock = threading.Lock()
+_sent = set()
+_pending = []
+# A single sender keeps posts in the order they were published
+_sender = ThreadPoolExecutor(max_workers=1, thread_name_prefix="slack")
+
+# === Client ===
+def get_client():
+    from slack_sdk import WebClient
+    from slack_sdk.http_retry.builtin_handlers import RateLimitErrorRetryHandler
+
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = WebClient(token=SLACK_BOT_TOKEN, base_url=SLACK_API_URL)
+            _client.retry_handlers.append(RateLimitErrorRetryHandler(max_retry_count=RATE_LIMIT_RETRIES))
+    return _client
+
+# === Sending ===
+def send(text, uploads, channel):
+    from slack_sdk.errors import SlackApiError, SlackClientError
+
+    # Any failure is logged and reported as False, so flush() never raises and record() skips the manifest
+    try:
+        if uploads:
+            get_client().files_upload_v2(
+                channel=channel,
+                file_uploads=uploads,
+                initial_comment=text,
+                request_file_info=False
+            )
+        else:
+            get_client().chat_postMessage(channel=channel, text=text)
+    except SlackApiError as e:
+        print("❌ Slack post failed:", e.response["error"])
+        return False
+    except (SlackClientError, OSError) as e:
+        print(f"❌ Slack post failed: {type(e).__name__}: {e}")
+        return False
+    return True
+
+def publish(text, files=(), channel=None):
+    # files: (path, title) pairs. They are read now, so a later run of the same report can
+    # overwrite the paths while this post is still queued.
+    if not ENABLED:
+        print("🔕 Slack disabled; not posting")
+        return None
+    channel = channel or SLACK_CHANNEL
+    uploads = []
+    digest = hashlib.sha1(f"{channel}\n{text}".encode())
+    for path, title in files:
+        with open(path, "rb") as f:
+            content = f.read()
+        digest.update(content)
+        uploads.append({"content": content, "filename": os.path.basename(path), "title": title})
+
+    with _client_lock:
+        if digest.hexdigest() in _sent:
+            print("↩️ Skipping duplicate Slack post")
+            return None
+        _sent.add(digest.hexdigest())
+    future = _sender.submit(send, text, uploads, channel)
+    _pending.append(future)
+    return future
+
+def disable():
+    global ENABLED
+    ENABLED = False
+
+def flush():
+    # Wait for every queued post; runs at exit too, so nothing is dropped when a script ends
+    while _pending:
+        _pending.pop(0).result()
+
+atexit.register(flush)
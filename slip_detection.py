@@ -0,0 +1,61 @@
+# SLIP DETECTION
+# Finds stories that slipped by reading Sprint-field transitions from their changelog.
+# Inline changelogs from search stop at 100 entries; only issues whose inline changelog was cut
+# short get their full history fetched, concurrently, from /issue/{key}/changelog.
+
+from jira_client import map_concurrent
+from jira_data import issue_changelog
+
+SPRINT_FIELD = "Sprint"
+
+# === Changelog parsing ===
+def sprint_names(value):
+    return {name.strip() for name in (value or "").split(",") if name.strip()}
+
+def sprint_moves(histories):
+    # A move is a Sprint change that adds a sprint to an issue that was already in one.
+    # Carry-over (S1 -> "S1, S2") and manual moves (S1 -> S2) both count; first assignment does not.
+    moves = []
+    for history in sorted(histories, key=lambda h: h.get("created", "")):
+        for item in history.get("items", []):
+            if item.get("field") != SPRINT_FIELD:
+                continue
+            before, after = sprint_names(item.get("fromString")), sprint_names(item.get("toString"))
+            if before and after - before:
+                moves.append((history.get("created"), item.get("fromString"), item.get("toString")))
+    return moves
+
+def is_truncated(changelog):
+    return changelog.get("total", 0) > len(changelog.get("histories", []))
+
+def slip_record(key, component, histories):
+    moves = sprint_moves(histories)
+    last = moves[-1] if moves else (None, None, None)
+    return {
+        "key": key,
+        "component": component,
+        "slipped": bool(moves),
+        "times_moved": len(moves),
+        "last_moved": last[0],
+        "from_sprint": last[1],
+        "to_sprint": last[2]
+    }
+
+# === Engine ===
+def detect(issues):
+    # One pass over the (streamed) issues, then one concurrent catch-up for truncated changelogs
+    records, truncated = [], []
+    for issue in issues:
+        comps = issue["fields"].get("components", [])
+        component = comps[0]["name"] if comps else "Unassigned"
+        changelog = issue.get("changelog", {})
+        if is_truncated(changelog):
+            truncated.append(len(records))
+        records.append(slip_record(issue["key"], component, changelog.get("histories", [])))
+
+    if truncated:
+        print(f"📜 Fetching full changelogs for {len(truncated)} issue(s) with truncated history")
+        full = map_concurrent(lambda i: issue_changelog(records[i]["key"]), truncated)
+        for i, histories in zip(truncated, full):
+            records[i] = slip_record(records[i]["key"], records[i]["component"], histories)
+    return records
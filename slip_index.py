@@ -0,0 +1,137 @@
+# SLIP INDEX
+# key -> (times_moved, last_moved, from/to sprint), built by slip_detection and kept on disk as one
+# columnar file. Each run re-reads only the cached issues whose `updated` changed since they were
+# indexed. The issue cache only holds open issues, so reports pass the keys they analyse (sprint
+# report issues, stories under an epic); any the index doesn't know yet, typically stories that
+# slipped and were later finished, are fetched with their changelogs and indexed too.
+
+import os
+import argparse
+import threading
+import importlib.util
+import pandas as pd
+from jira_client import CACHE_DIR
+from jira_data import project_issues, issues_by_key
+from slip_detection import detect
+
+# Parquet when pyarrow is installed (the scheduled workflow installs it), otherwise a gzipped pickle of the same frame
+if importlib.util.find_spec("pyarrow"):
+    INDEX_PATH = os.path.join(CACHE_DIR, "slip_index.parquet")
+else:
+    INDEX_PATH = os.path.join(CACHE_DIR, "slip_index.pkl.gz")
+
+COLUMNS = ["key", "issuetype", "component", "updated", "slipped", "times_moved", "last_moved", "from_sprint", "to_sprint"]
+
+_index = None
+_index_lock = threading.Lock()
+
+# === Disk ===
+def load_index():
+    try:
+        if INDEX_PATH.endswith(".parquet"):
+            return pd.read_parquet(INDEX_PATH)
+        return pd.read_pickle(INDEX_PATH)
+    except (OSError, ValueError):
+        return pd.DataFrame(columns=COLUMNS).set_index("key")
+
+def save_index(df):
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    tmp_path = INDEX_PATH + ".tmp"
+    if INDEX_PATH.endswith(".parquet"):
+        df.to_parquet(tmp_path)
+    else:
+        df.to_pickle(tmp_path, compression="gzip")
+    os.replace(tmp_path, INDEX_PATH)
+
+# === Build ===
+def index_frame(issues):
+    meta = {}
+
+    def tracked(issues):
+        for issue in issues:
+            fields = issue["fields"]
+            meta[issue["key"]] = (fields.get("issuetype", {}).get("name"), fields.get("updated"))
+            yield issue
+
+    records = detect(tracked(issues))
+    if not records:
+        return None
+    fresh = pd.DataFrame(records).set_index("key")
+    fresh["issuetype"] = [meta[key][0] for key in fresh.index]
+    fresh["updated"] = [meta[key][1] for key in fresh.index]
+    return fresh[COLUMNS[1:]]
+
+def merge(index, fresh):
+    return fresh if index.empty else pd.concat([index[~index.index.isin(fresh.index)], fresh])
+
+def refresh():
+    index = load_index()
+    known = index["updated"].to_dict()
+    fresh = index_frame(
+        issue for issue in project_issues(include_done=True)
+        if known.get(issue["key"]) != issue["fields"].get("updated")
+    )
+    if fresh is not None:
+        index = merge(index, fresh)
+        save_index(index)
+    print(f"🧭 Slip index: {0 if fresh is None else len(fresh)} issue(s) re-indexed, {int(index['slipped'].sum())} slipped of {len(index)}")
+    return index
+
+def get_index():
+    # Refreshed once per process; every lookup after that is a dict/index hit
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = refresh()
+    return _index
+
+def cover(keys):
+    # Makes sure every key is indexed. Cached issues are kept current by refresh(); anything else
+    # is fetched once and stays indexed until it changes (and so comes back through the issue cache)
+    global _index
+    get_index()
+    with _index_lock:
+        unknown = sorted(set(keys) - set(_index.index))
+        if unknown:
+            fresh = index_frame(issues_by_key(unknown))
+            if fresh is not None:
+                _index = merge(_index, fresh)
+                save_index(_index)
+            print(f"🧭 Slip index: {0 if fresh is None else len(fresh)} of {len(unknown)} issue(s) outside the cache indexed")
+    return _index
+
+# === Queries ===
+def normalize(keys):
+    return {key.strip().upper() for key in keys}
+
+def slipped(issuetype=None, keys=None):
+    # keys: restrict to (and make sure the index covers) the issues a report is looking at
+    if keys is None:
+        index = get_index()
+    else:
+        keys = normalize(keys)
+        index = cover(keys)
+        index = index[index.index.isin(keys)]
+    rows = index[index["slipped"].astype(bool)]
+    if issuetype:
+        rows = rows[rows["issuetype"] == issuetype]
+    return rows
+
+def slipped_keys(issuetype=None, keys=None):
+    return set(slipped(issuetype, keys).index)
+
+def lookup(key):
+    index = get_index()
+    key = key.strip().upper()
+    return index.loc[key].to_dict() if key in index.index else None
+
+# === Entry Point ===
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Refresh the slip index and optionally export the slipped issues")
+    parser.add_argument("--csv", help="Write the slipped issues to this CSV")
+    parser.add_argument("--issuetype", help="Only export this issue type (e.g. Story)")
+    args = parser.parse_args()
+    rows = slipped(args.issuetype)
+    if args.csv:
+        rows.reset_index().to_csv(args.csv, index=False)
+        print(f"✅ {len(rows)} slipped issue(s) written to {args.csv}")
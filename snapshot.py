@@ -0,0 +1,75 @@
+# SNAPSHOT
+# Crawls Jira once for every report and writes a versioned snapshot the reports can build from offline
+
+import os
+import gzip
+import json
+import argparse
+from datetime import datetime
+import jira_data
+
+SNAPSHOT_VERSION = 2
+SNAPSHOT_DIR = "snapshots"
+
+# === Crawl ===
+def crawl():
+    # Drive each report's own fetch step so the snapshot holds exactly what they ask for;
+    # overlapping lookups (closed sprints per board, project issues) are fetched once
+    import sprint_completion_report as completion
+    import sprint_readiness_report_v2 as readiness
+    import slip_detection
+    from dependency_edges import EdgeStore
+
+    jira_data.start_recording()
+    sprint_keys = set()
+    for team, board_id in completion.boards.items():
+        print(f"📥 Sprint reports: {team}")
+        sprint_keys.update(completion.get_sprint_report_data(board_id)["key"])
+    for team, board_id in readiness.boards.items():
+        print(f"📥 Velocity & readiness: {team}")
+        readiness.get_average_velocity(board_id)
+        readiness.get_ready_tickets(board_id)
+    print("📥 Project issues")
+    jira_data.project_issues()
+    print("📥 Linked issues outside the project set")
+    store = EdgeStore()
+    for issue in jira_data.project_issues():
+        store.add_issue(issue)
+    jira_data.linked_issues(store.external_keys())
+    print("📥 Full changelogs for issues with truncated history")
+    slip_detection.detect(jira_data.project_issues(include_done=True))
+    print("📥 Sprint report issues with their changelogs, for the slip index")
+    slip_detection.detect(jira_data.issues_by_key(sorted(sprint_keys)))
+
+    return {
+        "version": SNAPSHOT_VERSION,
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "data": jira_data.collected()
+    }
+
+# === Read / write ===
+def write_snapshot(snapshot, path=None):
+    if path is None:
+        os.makedirs(SNAPSHOT_DIR, exist_ok=True)
+        stamp = snapshot["created_at"].replace(":", "").replace("-", "")
+        path = os.path.join(SNAPSHOT_DIR, f"snapshot-v{SNAPSHOT_VERSION}-{stamp}.json.gz")
+    with gzip.open(path, "wt", encoding="utf-8") as f:
+        json.dump(snapshot, f)
+    return path
+
+def load_snapshot(path):
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        snapshot = json.load(f)
+    if snapshot.get("version") != SNAPSHOT_VERSION:
+        raise ValueError(f"{path} is snapshot version {snapshot.get('version')}, expected {SNAPSHOT_VERSION}")
+    jira_data.use_snapshot(snapshot["data"])
+    print(f"📦 Using snapshot {path} (taken {snapshot['created_at']})")
+    return snapshot
+
+# === Entry Point ===
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Crawl Jira once and write a snapshot for the reports")
+    parser.add_argument("--output", help="Snapshot file to write (default: snapshots/snapshot-v<N>-<time>.json.gz)")
+    args = parser.parse_args()
+    path = write_snapshot(crawl(), args.output)
+    print(f"✅ Snapshot written to {path}")
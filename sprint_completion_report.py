@@ -1,27 +1,19 @@
 # SPRINT COMPLETION REPORT — NOW SLIP-SMART™
 
-import os
-import base64
-import requests
+import argparse
+import numpy as np
 import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
 from dotenv import load_dotenv
-from slack_sdk import WebClient
+from jira_client import map_concurrent
+from charts import render
+from jira_data import closed_sprints, sprint_report
+from slip_index import slipped_keys
+from report_manifest import fingerprint, unchanged, record
+from slack_publisher import publish, disable as disable_slack
+from snapshot import load_snapshot
 
 # === Load .env ===
 load_dotenv()
-EMAIL = os.getenv("EMAIL")
-API_TOKEN = os.getenv("API_TOKEN")
-JIRA_DOMAIN = os.getenv("JIRA_DOMAIN")
-SLACK_BOT_TOKEN = os.getenv("SLACK_BOT_TOKEN")
-SLACK_CHANNEL = os.getenv("SLACK_CHANNEL_ID")
-
-# === Jira auth headers ===
-HEADERS = {
-    "Accept": "application/json",
-    "Authorization": f"Basic {base64.b64encode(f'{EMAIL}:{API_TOKEN}'.encode()).decode()}"
-}
 
 # === Team boards ===
 boards = {
@@ -33,108 +25,123 @@ boards = {
 # === File paths ===
 CSV_PATH = "sprint_completion_report.csv"
 CHART_PATH = "sprint_completion_chart.png"
-SLIPPED_ISSUES_PATH = "/Users/jameslogan/Documents/clean_sprint_watchdog/sprint_watchdog_filtered_slips.csv"
-
-# === Slack functions ===
-def post_to_slack(message):
-    client = WebClient(token=SLACK_BOT_TOKEN)
-    client.chat_postMessage(channel=SLACK_CHANNEL, text=message)
-
-def upload_chart_to_slack(file_path, title, explanation):
-    client = WebClient(token=SLACK_BOT_TOKEN)
-    with open(file_path, "rb") as file_content:
-        client.files_upload_v2(
-            channel=SLACK_CHANNEL,
-            file=file_content,
-            filename=os.path.basename(file_path),
-            title=title,
-            initial_comment=f"📊 *{title}*\n{explanation}"
-        )
+SPRINT_CSV_PATH = "sprint_completion_by_sprint.csv"
 
 # === Load slipped issue keys ===
-def load_slipped_issues():
-    try:
-        df = pd.read_csv(SLIPPED_ISSUES_PATH)
-        return set(df['key'].dropna().tolist())
-    except Exception as e:
-        print("⚠️ Error loading slipped stories:", e)
-        return set()
+def load_slipped_issues(keys):
+    # Slip status for exactly the sprint report issues, including Done ones outside the issue cache (see slip_index.py)
+    return slipped_keys(keys=keys)
 
 # === Sprint report API logic ===
-def get_sprint_report_data(board_id, slipped_keys):
-    url = f"{JIRA_DOMAIN}/rest/agile/1.0/board/{board_id}/sprint?state=closed"
-    r = requests.get(url, headers=HEADERS)
-    all_sprints = r.json().get("values", [])
+def get_sprint_report_data(board_id):
+    all_sprints = closed_sprints(board_id)
     sprints = all_sprints[-4:-1] if len(all_sprints) >= 4 else all_sprints[-3:]
 
-    results = []
-
-    for sprint in sprints:
-        sprint_id = sprint["id"]
-        report_url = f"{JIRA_DOMAIN}/rest/greenhopper/1.0/rapid/charts/sprintreport?rapidViewId={board_id}&sprintId={sprint_id}"
-        r = requests.get(report_url, headers=HEADERS)
-        data = r.json()
-
-        completed = data.get("contents", {}).get("completedIssues", [])
-        not_done = data.get("contents", {}).get("issuesNotCompletedInCurrentSprint", [])
+    # Sprint reports are fetched in parallel; JIRA_MAX_IN_FLIGHT caps the calls across all boards
+    reports = map_concurrent(lambda sprint: sprint_report(board_id, sprint["id"]), sprints)
+    return sprint_frame(board_id, sprints, reports)
+
+# === Story point frame: one row per (board, sprint, issue) ===
+def sprint_frame(board_id, sprints, reports):
+    sprint_ids, sprint_names, keys, points, completed = [], [], [], [], []
+    for sprint, contents in zip(sprints, reports):
+        for done, section in ((True, "completedIssues"), (False, "issuesNotCompletedInCurrentSprint")):
+            for issue in contents.get(section, []):
+                sprint_ids.append(sprint["id"])
+                sprint_names.append(sprint.get("name", ""))
+                keys.append(issue.get("key", "").strip().upper())
+                points.append(((issue.get("estimateStatistic") or {}).get("statFieldValue") or {}).get("value"))
+                completed.append(done)
+
+    frame = pd.DataFrame({
+        "board": pd.Series(board_id, index=range(len(keys)), dtype="int64"),
+        "sprint_id": pd.Series(sprint_ids, dtype="int64"),
+        "sprint": pd.Series(sprint_names, dtype="object"),
+        "key": pd.Series(keys, dtype="object"),
+        "points": pd.to_numeric(pd.Series(points, dtype="float64"), errors="coerce").fillna(0.0),
+        "completed": pd.Series(completed, dtype="bool")
+    })
+    return frame
+
+def sprint_breakdown(frame):
+    # Planned = every non-slipped issue's points; completed = the completed subset; slipped issues are excluded
+    kept = ~frame["slipped"]
+    return (
+        frame.assign(
+            planned=frame["points"].where(kept, 0.0),
+            done=frame["points"].where(kept & frame["completed"], 0.0),
+            excluded=frame["slipped"].astype("int64")
+        )
+        .groupby(["Team", "sprint_id", "sprint"], sort=False)[["planned", "done", "excluded"]]
+        .sum()
+        .rename(columns={"planned": "Planned Points", "done": "Completed Points", "excluded": "Excluded Issues"})
+        .reset_index()
+        .rename(columns={"sprint_id": "Sprint ID", "sprint": "Sprint"})
+    )
 
-        def get_key(issue):
-            return issue.get("key", "").strip().upper()
+def completion_percent(df):
+    planned = df["Planned Points"].to_numpy()
+    completed = df["Completed Points"].to_numpy()
+    percent = np.divide(completed * 100, planned, out=np.zeros_like(planned), where=planned > 0)
+    return np.round(percent, 1)
 
-        planned_issues = [i for i in completed + not_done if get_key(i) not in slipped_keys]
-        completed_issues = [i for i in completed if get_key(i) not in slipped_keys]
-        all_issues = completed + not_done  # before filtering
+# === Chart (rendered by charts.render) ===
+def draw_chart(df):
+    import matplotlib.pyplot as plt
+    import seaborn as sns
 
-        results.append((planned_issues, completed_issues, all_issues))
+    sns.set_theme(style="whitegrid")
+    plt.figure(figsize=(10, 6))
+    bar = sns.barplot(data=df, x="Team", y="Completion %", hue="Team", palette="Set2", legend=False)
 
-    return results
+    for i, row in df.iterrows():
+        bar.text(i, row["Completion %"] + 2, f'{row["Completion %"]}%', ha='center', fontweight='bold')
 
+    plt.title("Sprint Completion by Team (Slipped Stories Excluded)", fontsize=14, fontweight='bold')
+    plt.ylabel("Completion %")
+    plt.ylim(0, 120)
+    plt.xticks(fontsize=11)
+    plt.figtext(0.5, -0.1,
+        "Only includes stories that remained in the sprint and were not moved to a future sprint.",
+        wrap=True, horizontalalignment='center', fontsize=9, color="gray")
+    plt.tight_layout()
 
 # === Report Builder ===
-def build_report():
-    slipped_keys = load_slipped_issues()
-    # Normalize slipped keys just in case
-    slipped_keys = set(k.strip().upper() for k in slipped_keys)
-
-    rows = []
+def build_report(csv_only=False):
+    # Fetch every board at once, then stack them into one frame in `boards` order
+    board_data = map_concurrent(get_sprint_report_data, boards.values())
+    frame = pd.concat([data.assign(Team=team) for team, data in zip(boards, board_data)], ignore_index=True)
+    # Slip status is looked up for the issues these sprints actually hold
+    frame["slipped"] = frame["key"].isin(load_slipped_issues(frame["key"].unique()))
+    digest = fingerprint(frame)
+    if unchanged("completion", digest):
+        return
+
+    by_sprint = sprint_breakdown(frame)
+    by_sprint["Completion %"] = completion_percent(by_sprint)
+    by_sprint.to_csv(SPRINT_CSV_PATH, index=False)
+
+    df = (
+        by_sprint.groupby("Team", sort=False)[["Planned Points", "Completed Points"]]
+        .sum()
+        .reindex(list(boards), fill_value=0.0)
+        .reset_index()
+    )
+    df["Completion %"] = completion_percent(df)
 
-    for team, board_id in boards.items():
+    excluded = frame.loc[frame["slipped"]].groupby("Team", sort=False)["key"].agg(list)
+    for row in df.to_dict("records"):
+        team = row["Team"]
+        excluded_keys = excluded.get(team, [])
         print(f"\n🔍 Checking team: {team}")
-        sprint_data = get_sprint_report_data(board_id, slipped_keys)
-
-        total_planned = 0
-        total_completed = 0
-        excluded_keys = []
-
-        for sprint_id, (planned_issues, completed_issues, all_issues) in enumerate(sprint_data):
-            planned_ids = [i.get("key", "") for i in planned_issues]
-            completed_ids = [i.get("key", "") for i in completed_issues]
-            all_ids = [i.get("key", "") for i in all_issues]
-            filtered_out = [k for k in all_ids if k.upper() in slipped_keys]
-            excluded_keys.extend(filtered_out)
-
-            total_planned += sum(i.get("estimateStatistic", {}).get("statFieldValue", {}).get("value", 0) for i in planned_issues)
-            total_completed += sum(i.get("estimateStatistic", {}).get("statFieldValue", {}).get("value", 0) for i in completed_issues)
-
-        percent = round((total_completed / total_planned) * 100, 1) if total_planned else 0
-
-        print(f"🧮 {team} - Planned Points: {total_planned}, Completed Points: {total_completed}, Completion %: {percent}")
+        print(f"🧮 {team} - Planned Points: {row['Planned Points']:g}, Completed Points: {row['Completed Points']:g}, Completion %: {row['Completion %']}")
         print(f"🚫 Excluded Issues (Slipped): {excluded_keys[:10]}{' ...' if len(excluded_keys) > 10 else ''}")
 
-        rows.append({
-            "Team": team,
-            "Planned Points": total_planned,
-            "Completed Points": total_completed,
-            "Completion %": percent
-        })
-
-    df = pd.DataFrame(rows)
-
     # Save CSV with explanation
     explanation = (
         "\n\n---\nExplanation:\n"
         "Only includes stories committed at sprint start and not removed or slipped to future sprints.\n"
-        "• Slipped stories were excluded using `sprint_watchdog_filtered_slips.csv`\n"
+        "• Slipped stories were excluded using the slip index built from each issue's Sprint changelog\n"
         "• Completion % = (Completed Story Points / Planned) * 100\n"
         "• This version prints debug info to help validate filtering logic."
     )
@@ -142,25 +149,10 @@ def build_report():
     with open(CSV_PATH, "a") as f:
         f.write(explanation)
 
+    if csv_only:
+        return
 
-    # Chart
-    sns.set_theme(style="whitegrid")
-    plt.figure(figsize=(10, 6))
-    bar = sns.barplot(data=df, x="Team", y="Completion %", hue="Team", palette="Set2", legend=False)
-
-    for i, row in df.iterrows():
-        bar.text(i, row["Completion %"] + 2, f'{row["Completion %"]}%', ha='center', fontweight='bold')
-
-    plt.title("Sprint Completion by Team (Slipped Stories Excluded)", fontsize=14, fontweight='bold')
-    plt.ylabel("Completion %")
-    plt.ylim(0, 120)
-    plt.xticks(fontsize=11)
-    plt.figtext(0.5, -0.1,
-        "Only includes stories that remained in the sprint and were not moved to a future sprint.",
-        wrap=True, horizontalalignment='center', fontsize=9, color="gray")
-    plt.tight_layout()
-    plt.savefig(CHART_PATH, bbox_inches='tight')
-    plt.close()
+    [chart] = render([(draw_chart, (df,), CHART_PATH)])
 
     # Post to Slack
     slack_summary = (
@@ -169,13 +161,21 @@ def build_report():
         "_Stories that were moved to future sprints were excluded to ensure accuracy._"
     )
 
-    post_to_slack(slack_summary)
-    upload_chart_to_slack(
-        CHART_PATH,
-        "Sprint Completion by Team (No Slips)",
-        "This chart reflects true sprint execution by removing all stories that were moved to later sprints."
+    post = publish(
+        slack_summary + "\n📊 This chart reflects true sprint execution by removing all stories that were moved to later sprints.",
+        [(chart, "Sprint Completion by Team (No Slips)")]
     )
+    record("completion", digest, post)
 
 # === Run the report ===
 if __name__ == "__main__":
-    build_report()
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--snapshot", help="Build from a snapshot file (see snapshot.py) instead of calling Jira")
+    parser.add_argument("--csv-only", action="store_true", help="Write the CSVs only: no chart, no Slack")
+    parser.add_argument("--no-slack", action="store_true", help="Build everything but don't post to Slack")
+    args = parser.parse_args()
+    if args.snapshot:
+        load_snapshot(args.snapshot)
+    if args.no_slack or args.csv_only:
+        disable_slack()
+    build_report(args.csv_only)
@@ -0,0 +1,53 @@
+# SPRINT INDEX
+# On-disk cache of each board's closed sprints; later runs only page through the tail
+
+import os
+import json
+from jira_client import CACHE_DIR, get_json
+
+INDEX_DIR = os.path.join(CACHE_DIR, "sprints")
+PAGE_SIZE = 50
+# Closed sprints are appended at the end of the board's list, so re-reading a few entries
+# before the cached tail picks up new sprints plus late edits near the end in a single page
+REFETCH_OVERLAP = 10
+SPRINT_KEYS = ["id", "name", "state", "startDate", "endDate", "completeDate"]
+
+# === Disk ===
+def index_path(board_id):
+    return os.path.join(INDEX_DIR, f"board_{board_id}.json")
+
+def load_index(board_id):
+    try:
+        with open(index_path(board_id)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return []
+
+def save_index(board_id, sprints):
+    os.makedirs(INDEX_DIR, exist_ok=True)
+    tmp_path = index_path(board_id) + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(sprints, f)
+    os.replace(tmp_path, index_path(board_id))
+
+# === Fetch ===
+def fetch_closed_sprints(board_id, start_at):
+    sprints = []
+    while True:
+        data = get_json(
+            f"/rest/agile/1.0/board/{board_id}/sprint",
+            {"state": "closed", "startAt": start_at, "maxResults": PAGE_SIZE}
+        )
+        values = data.get("values", [])
+        sprints.extend({k: s.get(k) for k in SPRINT_KEYS} for s in values)
+        if data.get("isLast", True) or not values:
+            return sprints
+        start_at += len(values)
+
+def closed_sprints(board_id):
+    cached = load_index(board_id)
+    start_at = max(0, len(cached) - REFETCH_OVERLAP)
+    sprints = cached[:start_at] + fetch_closed_sprints(board_id, start_at)
+    if sprints != cached:
+        save_index(board_id, sprints)
+    return sprints
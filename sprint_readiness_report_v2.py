@@ -2,29 +2,20 @@
 # Compares To Do + Ready tickets against average velocity per board
 
 import os
-import base64
-import requests
+import argparse
 import pandas as pd
-import matplotlib.pyplot as plt
 from dotenv import load_dotenv
-from slack_sdk import WebClient
-from slack_sdk.errors import SlackApiError
 from collections import defaultdict
+from charts import render
+from jira_data import last_closed_sprints, active_sprints, sprint_issues
+from report_manifest import fingerprint, unchanged, record
+from slack_publisher import publish, disable as disable_slack
+from snapshot import load_snapshot
 
 # === Load Environment ===
 load_dotenv()
-EMAIL = os.getenv("EMAIL")
-API_TOKEN = os.getenv("API_TOKEN")
-JIRA_DOMAIN = os.getenv("JIRA_DOMAIN")
-SLACK_BOT_TOKEN = os.getenv("SLACK_BOT_TOKEN")
-SLACK_CHANNEL = os.getenv("SLACK_CHANNEL_ID")
 STORY_POINTS_FIELD = os.getenv("STORY_POINTS_FIELD")
 
-HEADERS = {
-    "Accept": "application/json",
-    "Authorization": f"Basic {base64.b64encode(f'{EMAIL}:{API_TOKEN}'.encode()).decode()}"
-}
-
 # === Board Map ===
 boards = {
     "Data Science": 251,
@@ -39,34 +30,14 @@ CSV_PATH = "sprint_readiness_report.csv"
 BAR_CHART = "sprint_readiness_chart.png"
 PIE_CHART = "sprint_ticket_distribution.png"
 
-# === Slack Posting ===
-def post_to_slack(message):
-    client = WebClient(token=SLACK_BOT_TOKEN)
-    client.chat_postMessage(channel=SLACK_CHANNEL, text=message)
-
-def upload_chart_to_slack(file_path, title):
-    client = WebClient(token=SLACK_BOT_TOKEN)
-    with open(file_path, "rb") as file_content:
-        client.files_upload_v2(
-            channel=SLACK_CHANNEL,
-            file=file_content,
-            filename=os.path.basename(file_path),
-            title=title,
-            initial_comment=f"📊 {title}"
-        )
-
 # === Velocity Calculation ===
 def get_average_velocity(board_id):
-    url = f"{JIRA_DOMAIN}/rest/agile/1.0/board/{board_id}/sprint?state=closed"
-    r = requests.get(url, headers=HEADERS)
-    sprints = r.json().get("values", [])[-2:]  # last 2
+    sprints = last_closed_sprints(board_id, 2)
     velocities = []
     for sprint in sprints:
         sprint_id = sprint["id"]
-        issues_url = f"{JIRA_DOMAIN}/rest/agile/1.0/sprint/{sprint_id}/issue?maxResults=100"
-        resp = requests.get(issues_url, headers=HEADERS)
         completed_points = 0
-        for issue in resp.json().get("issues", []):
+        for issue in sprint_issues(sprint_id):
             fields = issue.get("fields", {})
             status = fields.get("status", {}).get("statusCategory", {}).get("key", "")
             points = fields.get(STORY_POINTS_FIELD)
@@ -77,23 +48,40 @@ def get_average_velocity(board_id):
 
 # === Readiness Calculation ===
 def get_ready_tickets(board_id):
-    url = f"{JIRA_DOMAIN}/rest/agile/1.0/board/{board_id}/sprint?state=active"
-    resp = requests.get(url, headers=HEADERS)
-    sprints = resp.json().get("values", [])
+    sprints = active_sprints(board_id)
     if not sprints:
         return 0
     sprint_id = sprints[0]["id"]
-    issues_url = f"{JIRA_DOMAIN}/rest/agile/1.0/sprint/{sprint_id}/issue?maxResults=100"
-    resp = requests.get(issues_url, headers=HEADERS)
     count = 0
-    for issue in resp.json().get("issues", []):
+    for issue in sprint_issues(sprint_id):
         status = issue["fields"].get("status", {}).get("name", "")
         if status in READY_STATUSES:
             count += 1
     return count
 
+# === Charts (rendered side by side by charts.render) ===
+def draw_bar_chart(df):
+    import matplotlib.pyplot as plt
+
+    plt.figure(figsize=(10, 6))
+    df.sort_values("Readiness_%", ascending=False).plot(
+        kind="bar", x="Team", y="Readiness_%", legend=False
+    )
+    plt.title("Sprint Readiness by Team (% of Avg Velocity)")
+    plt.ylabel("Readiness %")
+    plt.tight_layout()
+
+def draw_pie_chart(df):
+    import matplotlib.pyplot as plt
+
+    plt.figure(figsize=(6, 6))
+    df.set_index("Team")["Tickets_Ready"].plot.pie(autopct="%1.1f%%")
+    plt.ylabel("")
+    plt.title("Ready Ticket Distribution by Team")
+    plt.tight_layout()
+
 # === Report ===
-def build_report():
+def build_report(csv_only=False):
     rows = []
     for team, board_id in boards.items():
         velocity = get_average_velocity(board_id)
@@ -107,27 +95,15 @@ def build_report():
         })
 
     df = pd.DataFrame(rows)
+    digest = fingerprint(df)
+    if unchanged("readiness", digest):
+        return
     df.to_csv(CSV_PATH, index=False)
 
-    # Bar Chart
-    plt.figure(figsize=(10, 6))
-    df.sort_values("Readiness_%", ascending=False).plot(
-        kind="bar", x="Team", y="Readiness_%", legend=False
-    )
-    plt.title("Sprint Readiness by Team (% of Avg Velocity)")
-    plt.ylabel("Readiness %")
-    plt.tight_layout()
-    plt.savefig(BAR_CHART)
-    plt.close()
+    if csv_only:
+        return
 
-    # Pie Chart
-    plt.figure(figsize=(6, 6))
-    df.set_index("Team")["Tickets_Ready"].plot.pie(autopct="%1.1f%%")
-    plt.ylabel("")
-    plt.title("Ready Ticket Distribution by Team")
-    plt.tight_layout()
-    plt.savefig(PIE_CHART)
-    plt.close()
+    bar_chart, pie_chart = render([(draw_bar_chart, (df,), BAR_CHART), (draw_pie_chart, (df,), PIE_CHART)])
 
     # Slack Summary
     summary = (
@@ -139,17 +115,18 @@ def build_report():
         "compared to average team velocity across the last 2 sprints."
     )
 
-    post_to_slack(summary)
-    upload_chart_to_slack(BAR_CHART, "Readiness by Team")
-    upload_chart_to_slack(PIE_CHART, "Ticket Distribution")
-
-
-
-
-    post_to_slack(summary)
-    upload_chart_to_slack(BAR_CHART, "Readiness by Team")
-    upload_chart_to_slack(PIE_CHART, "Ticket Distribution")
+    post = publish(summary, [(bar_chart, "Readiness by Team"), (pie_chart, "Ticket Distribution")])
+    record("readiness", digest, post)
 
 # === Entry Point ===
 if __name__ == "__main__":
-    build_report()
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--snapshot", help="Build from a snapshot file (see snapshot.py) instead of calling Jira")
+    parser.add_argument("--csv-only", action="store_true", help="Write the CSV only: no charts, no Slack")
+    parser.add_argument("--no-slack", action="store_true", help="Build everything but don't post to Slack")
+    args = parser.parse_args()
+    if args.snapshot:
+        load_snapshot(args.snapshot)
+    if args.no_slack or args.csv_only:
+        disable_slack()
+    build_report(args.csv_only)
@@ -0,0 +1,120 @@
+# SPRINTWATCH
+# One entry point for the scheduled reports, run in a single process:
+#
+#   python sprintwatch.py run completion readiness dependencies slipping
+#
+# Libraries are imported once (plotting and Slack not at all with --csv-only), every report shares
+# the Jira session, the issue cache sync and the jira_data lookups, and the data the reports need
+# is fetched up front in parallel. Reports then build one after another (pyplot state is process-global)
+# while their Slack posts upload in the background.
+
+import sys
+import time
+import argparse
+import importlib
+import traceback
+from jira_client import map_concurrent
+
+REPORTS = {
+    "completion": ("sprint_completion_report", "build_report"),
+    "readiness": ("sprint_readiness_report_v2", "build_report"),
+    "dependencies": ("dependency_status_report", "build_report"),
+    "slipping": ("slipping_stories_report", "main")
+}
+
+# === Shared prefetch ===
+def warm_sprint_reports(modules):
+    # Sprint reports, then slip status for the issues they hold (Done ones included)
+    completion = modules["completion"]
+    frames = map_concurrent(completion.get_sprint_report_data, completion.boards.values())
+    completion.load_slipped_issues(set().union(*(frame["key"] for frame in frames)))
+
+def warm_sprints(modules):
+    import jira_data
+    readiness = modules["readiness"]
+    for board_id in readiness.boards.values():
+        jira_data.last_closed_sprints(board_id, 2)
+        jira_data.active_sprints(board_id)
+
+def warm_slip_index(modules):
+    # Syncs the issue cache and pulls any truncated changelogs
+    import slip_index
+    slip_index.get_index()
+
+def warm_issue_cache(modules):
+    import jira_data
+    for _ in jira_data.project_issues():
+        break
+
+def warm(task, modules):
+    try:
+        task(modules)
+    except Exception as e:
+        print(f"⚠️ Warmup {task.__name__} failed ({type(e).__name__}: {e}); its reports will retry")
+
+WARMUPS = {
+    "completion": [warm_sprint_reports, warm_slip_index],
+    "readiness": [warm_sprints],
+    "dependencies": [warm_issue_cache],
+    "slipping": [warm_slip_index]
+}
+
+# === Run ===
+def run(names, snapshot=None, csv_only=False):
+    if snapshot:
+        from snapshot import load_snapshot
+        load_snapshot(snapshot)
+
+    started = time.perf_counter()
+    modules = {name: importlib.import_module(REPORTS[name][0]) for name in names}
+    print(f"📦 Imported {len(modules)} report(s) in {time.perf_counter() - started:.1f}s")
+
+    # Each warmup only fills shared caches, so they can run side by side. A failed warmup is only
+    # logged: its report hits the same error again while building and fails on its own.
+    started = time.perf_counter()
+    tasks = list(dict.fromkeys(task for name in names for task in WARMUPS[name]))
+    map_concurrent(lambda task: warm(task, modules), tasks, max_workers=len(tasks))
+    print(f"📥 Shared Jira data ready in {time.perf_counter() - started:.1f}s")
+
+    failed = []
+    for name in names:
+        print(f"\n▶️ {name}")
+        started = time.perf_counter()
+        try:
+            getattr(modules[name], REPORTS[name][1])(csv_only=csv_only)
+        except Exception:
+            traceback.print_exc()
+            failed.append(name)
+            continue
+        print(f"✅ {name} done in {time.perf_counter() - started:.1f}s")
+
+    from slack_publisher import flush
+    flush()
+    return failed
+
+# === Entry Point ===
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(prog="sprintwatch", description="Run Sprint Watch reports in one process")
+    commands = parser.add_subparsers(dest="command", required=True)
+    run_parser = commands.add_parser("run", help="Run one or more reports")
+    run_parser.add_argument("reports", nargs="*", metavar="report", help=f"Any of: {', '.join(REPORTS)} (default: all)")
+    run_parser.add_argument("--snapshot", help="Build from a snapshot file (see snapshot.py) instead of calling Jira")
+    run_parser.add_argument("--csv-only", action="store_true", help="Write the CSVs only: no charts, no Slack")
+    run_parser.add_argument("--no-slack", action="store_true", help="Build everything but don't post to Slack")
+    run_parser.add_argument("--force", action="store_true", help="Rebuild and repost even if the inputs are unchanged")
+    args = parser.parse_args()
+    unknown = [name for name in args.reports if name not in REPORTS]
+    if unknown:
+        parser.error(f"unknown report(s): {', '.join(unknown)}")
+
+    if args.force:
+        import report_manifest
+        report_manifest.FORCE = True
+    if args.no_slack or args.csv_only:
+        from slack_publisher import disable
+        disable()
+
+    failed = run(list(dict.fromkeys(args.reports or REPORTS)), args.snapshot, args.csv_only)
+    if failed:
+        print(f"❌ Failed: {', '.join(failed)}")
+        sys.exit(1)
@@ -0,0 +1,140 @@
+# TRACING
+# Records every Jira and Slack call (endpoint, status, latency, bytes, retries) and prints a
+# timing summary at exit. Turn on with SPRINTWATCH_TRACE=1; set SPRINTWATCH_TRACE_FILE=trace.json
+# to also write a Chrome trace (open in chrome://tracing or ui.perfetto.dev).
+
+import os
+import re
+import json
+import math
+import time
+import atexit
+import threading
+import functools
+from urllib.parse import unquote_plus
+from collections import defaultdict
+
+ENABLED = os.getenv("SPRINTWATCH_TRACE", "").lower() in ("1", "true", "yes")
+TRACE_FILE = os.getenv("SPRINTWATCH_TRACE_FILE")
+SLOWEST_SHOWN = 10
+
+_calls = []
+_origin = time.perf_counter()
+_installed = False
+
+# === Recording ===
+def endpoint_name(path):
+    # Collapse board/sprint ids and issue keys so calls group per endpoint
+    return re.sub(r"/(\d{2,}|[A-Z][A-Z0-9]*-\d+)(?=/|$)", "/{id}", path)
+
+def record(service, endpoint, status, started, elapsed, size=0, retries=0, detail=""):
+    _calls.append({
+        "service": service,
+        "endpoint": endpoint,
+        "status": status,
+        "start_ms": round((started - _origin) * 1000, 3),
+        "latency_ms": round(elapsed * 1000, 3),
+        "bytes": size,
+        "retries": retries,
+        "detail": detail,
+        "thread": threading.get_ident()
+    })
+
+def trace_jira(send, url):
+    # Wraps one Jira request; `send` performs it and returns the requests.Response
+    started = time.perf_counter()
+    try:
+        r = send()
+    except Exception as e:
+        record("jira", endpoint_name(url.split("?")[0]), type(e).__name__, started, time.perf_counter() - started, detail=url)
+        raise
+    history = getattr(getattr(r.raw, "retries", None), "history", ()) or ()
+    record(
+        "jira", endpoint_name(r.request.path_url.split("?")[0]), r.status_code, started, time.perf_counter() - started,
+        len(r.content), len(history), r.request.path_url
+    )
+    return r
+
+def traced_slack_method(method):
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        started = time.perf_counter()
+        status = "ok"
+        try:
+            return method(self, *args, **kwargs)
+        except Exception as e:
+            status = type(e).__name__
+            raise
+        finally:
+            record("slack", method.__name__, status, started, time.perf_counter() - started, detail=str(kwargs.get("title", "")))
+    return wrapper
+
+# === Summary ===
+def percentile(values, p):
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(p * len(ordered)) - 1)]
+
+def summary():
+    if not _calls:
+        return "📈 Trace: no Jira or Slack calls were made"
+    groups = defaultdict(list)
+    for call in _calls:
+        groups[(call["service"], call["endpoint"])].append(call)
+
+    retried = sum(1 for call in _calls if call["retries"])
+    services = defaultdict(int)
+    for call in _calls:
+        services[call["service"]] += 1
+    lines = [
+        f"📈 Trace: {len(_calls)} requests ({', '.join(f'{n} {s}' for s, n in services.items())}), "
+        f"{retried} retried, {sum(c['latency_ms'] for c in _calls) / 1000:.2f}s total call time",
+        f"{'endpoint':<58} {'calls':>6} {'p50 ms':>9} {'p95 ms':>9} {'max ms':>9} {'KB':>9}"
+    ]
+    for (service, endpoint), calls in sorted(groups.items(), key=lambda g: -sum(c["latency_ms"] for c in g[1])):
+        latencies = [c["latency_ms"] for c in calls]
+        lines.append(
+            f"{(service + ' ' + endpoint)[:58]:<58} {len(calls):>6} {percentile(latencies, 0.5):>9.1f} "
+            f"{percentile(latencies, 0.95):>9.1f} {max(latencies):>9.1f} {sum(c['bytes'] for c in calls) / 1024:>9.1f}"
+        )
+    lines.append("🐢 Slowest calls:")
+    for call in sorted(_calls, key=lambda c: -c["latency_ms"])[:SLOWEST_SHOWN]:
+        detail = unquote_plus(call["detail"] or call["endpoint"])[:160]
+        lines.append(f"   {call['latency_ms']:>9.1f} ms  {call['status']}  {call['service']} {detail}")
+    return "\n".join(lines)
+
+def write_chrome_trace(path):
+    events = [{
+        "name": call["endpoint"],
+        "cat": call["service"],
+        "ph": "X",
+        "ts": call["start_ms"] * 1000,
+        "dur": call["latency_ms"] * 1000,
+        "pid": os.getpid(),
+        "tid": call["thread"],
+        "args": {k: call[k] for k in ("status", "bytes", "retries", "detail")}
+    } for call in _calls]
+    with open(path, "w") as f:
+        json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+
+def report_at_exit():
+    print(summary())
+    if TRACE_FILE:
+        write_chrome_trace(TRACE_FILE)
+        print(f"🧾 Chrome trace written to {TRACE_FILE}")
+
+# === Install ===
+def install():
+    global _installed
+    if _installed:
+        return
+    _installed = True
+    try:
+        from slack_sdk import WebClient
+        WebClient.chat_postMessage = traced_slack_method(WebClient.chat_postMessage)
+        WebClient.files_upload_v2 = traced_slack_method(WebClient.files_upload_v2)
+    except ImportError:
+        pass
+    atexit.register(report_at_exit)
+
+if ENABLED:
+    install()